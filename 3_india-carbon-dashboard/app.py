@@ -11,6 +11,10 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from backends import get_backend
+from carbon_liability import CarbonModel, PATHWAY_MULT
+from price_feed import feed_from_source
+
 # Page Config
 st.set_page_config(
     page_title="India Carbon Liability Dashboard",
@@ -23,6 +27,8 @@ st.set_page_config(
 VERSION = "6.0.0"
 AUTHOR = "Bosco Chiramel"
 PAPER = "Carbon Liability and Decarbonization Pathways for India's Petroleum Refining Sector"
+PRICE_REFRESH_SECONDS = 30
+FX_TO_USD = {"€": 1.08}  # default $ per unit for non-$ live quotes (editable in the sidebar)
 
 # Data
 @st.cache_data
@@ -53,16 +59,13 @@ def load_refinery_data():
         {"name": "Bongaigaon", "operator": "IOCL", "type": "PSU", "capacity": 2.35, "age": 45, "liability": 0.12, "risk": "BB", "state": "Assam", "lat": 26.48, "lon": 90.56},
     ])
 
-@st.cache_data
+@st.cache_resource
+def get_price_feed():
+    """One feed shared by all sessions (source from $CARBON_PRICE_FEED)"""
+    return feed_from_source(ttl=PRICE_REFRESH_SECONDS)
+
 def load_global_prices():
-    return pd.DataFrame([
-        {"market": "EU ETS", "price": 68.5, "currency": "€", "region": "Europe"},
-        {"market": "UK ETS", "price": 42.1, "currency": "£", "region": "Europe"},
-        {"market": "California", "price": 35.8, "currency": "$", "region": "Americas"},
-        {"market": "China", "price": 9.2, "currency": "¥", "region": "Asia"},
-        {"market": "Korea", "price": 8.5, "currency": "₩", "region": "Asia"},
-        {"market": "India (Est.)", "price": 20.0, "currency": "₹", "region": "Asia"},
-    ])
+    return get_price_feed().to_frame()
 
 GLOSSARY = {
     "Carbon Liability": "Present value of future carbon costs over asset lifetime",
@@ -77,22 +80,28 @@ GLOSSARY = {
     "CCUS": "Carbon Capture, Utilization and Storage technology",
 }
 
-PATHWAY_MULT = {"BAU": 1.44, "Moderate": 1.21, "Aggressive": 1.0, "Early Action": 0.92}
+# Compute backend ($CARBON_BACKEND: numpy|numba|auto)
+BACKEND = get_backend()
 
 # Helper Functions
+def scenario_model(price, rate, pathway):
+    """CarbonModel on the selected backend, set to the sidebar scenario"""
+    return CarbonModel(backend=BACKEND).set_scenario(price, rate, pathway)
+
 def calculate_liability(price, rate, pathway):
     """Calculate carbon liability based on scenario parameters"""
-    return round(13.1 * (price / 50) * PATHWAY_MULT[pathway] * (10 / rate), 1)
+    return scenario_model(price, rate, pathway).calculate_liability()
 
 def monte_carlo_simulation(price, rate, pathway, n=1000):
     """Run Monte Carlo simulation"""
-    results = []
-    for _ in range(n):
-        p_var = 1 + (np.random.random() - 0.5) * 0.6
-        e_var = 1 + (np.random.random() - 0.5) * 0.4
-        results.append(13.1 * (price / 50) * p_var * PATHWAY_MULT[pathway] * e_var * (10 / rate))
-    results.sort()
-    return {"p5": round(results[50], 1), "p50": round(results[500], 1), "p95": round(results[950], 1)}
+    return scenario_model(price, rate, pathway).monte_carlo(n)
+
+@st.cache_data
+def optimize_transition_fund(price, rate, pathway, budget):
+    """Optimal per-refinery actions for a transition fund budget"""
+    model = scenario_model(price, rate, pathway)
+    model.refineries = load_refinery_data()
+    return model.optimize_investments(budget)
 
 def generate_insights(price, pathway, liability):
     """Generate AI-style insights based on scenario"""
@@ -150,7 +159,31 @@ st.markdown("""
 
 # Load Data
 df = load_refinery_data()
-prices_df = load_global_prices()
+price_feed = get_price_feed()
+
+# Live price widgets (rerun on their own, not the whole script)
+@st.fragment(run_every=PRICE_REFRESH_SECONDS)
+def eu_ets_metric():
+    quote = price_feed.latest("EU ETS")
+    if price_feed.is_stale:
+        delta = "Offline"
+    else:
+        delta = f"{quote.change_pct:+.1f}%" if quote.change_pct is not None else "Live"
+    st.metric("EU ETS Price", f"{quote.currency}{quote.price}", delta)
+
+@st.fragment(run_every=PRICE_REFRESH_SECONDS)
+def global_prices_chart():
+    fig_bar = px.bar(
+        load_global_prices(),
+        x='price',
+        y='market',
+        orientation='h',
+        color='region',
+        color_discrete_map={'Europe': '#3b82f6', 'Americas': '#22c55e', 'Asia': '#f59e0b'}
+    )
+    fig_bar.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                         yaxis={'categoryorder': 'total ascending'})
+    st.plotly_chart(fig_bar, use_container_width=True)
 
 # Sidebar
 with st.sidebar:
@@ -161,8 +194,22 @@ with st.sidebar:
     st.divider()
     st.subheader("📊 Scenario Controls")
     
+    use_live_price = st.toggle("📡 Use live EU ETS price",
+                               help="Take the carbon price from the latest feed quote")
     carbon_price = st.slider("Carbon Price (2030)", 10, 200, 50, 5, 
-                             help="Projected carbon price per tonne CO₂ in 2030")
+                             help="Projected carbon price per tonne CO₂ in 2030",
+                             disabled=use_live_price)
+    if use_live_price:
+        quote = price_feed.latest("EU ETS")
+        fx_rate = 1.0
+        if quote.currency != "$":
+            fx_rate = st.number_input(f"$ per {quote.currency}", 0.0, None,
+                                      FX_TO_USD.get(quote.currency, 1.0), 0.01,
+                                      help="Converts the EU ETS quote to the model's $/t")
+        carbon_price = round(quote.price * fx_rate, 1)
+        converted = f" ≈ ${carbon_price}/t" if quote.currency != "$" else ""
+        st.caption(f"Live carbon price: {quote.currency}{quote.price}/t{converted}"
+                   + (" (feed offline, showing last known price)" if price_feed.is_stale else ""))
     discount_rate = st.slider("Discount Rate (%)", 5.0, 15.0, 10.0, 0.5,
                               help="Rate for present value calculations")
     pathway = st.selectbox("Decarbonization Pathway", list(PATHWAY_MULT.keys()),
@@ -175,7 +222,7 @@ with st.sidebar:
     mc = monte_carlo_simulation(carbon_price, discount_rate, pathway)
     
     st.metric("💰 Your Estimate", f"${liability}B", delta=f"{pathway}")
-    st.metric("📊 90% Range", f"${mc['p5']}-{mc['p95']}B", delta="Monte Carlo")
+    st.metric("📊 90% Range", f"${mc.p5}-{mc.p95}B", delta="Monte Carlo")
     
     st.divider()
     st.caption(f"Based on: {PAPER}")
@@ -189,13 +236,13 @@ col1, col2, col3, col4, col5, col6 = st.columns(6)
 with col1:
     st.metric("Your Estimate", f"${liability}B", pathway)
 with col2:
-    st.metric("90% Range", f"${mc['p5']}-{mc['p95']}B", "Monte Carlo")
+    st.metric("90% Range", f"${mc.p5}-{mc.p95}B", "Monte Carlo")
 with col3:
     st.metric("Govt Exposure", "$17.7B", "PSU + Stranded")
 with col4:
     st.metric("Base Case", "$13.1B", "Aggressive")
 with col5:
-    st.metric("EU ETS Price", "€68.5", "+2.3%")
+    eu_ets_metric()
 with col6:
     insights = generate_insights(carbon_price, pathway, liability)
     warnings = len([i for i in insights if i['type'] in ['critical', 'warning']])
@@ -223,17 +270,7 @@ with tab1:
     
     with col2:
         st.subheader("Global Carbon Prices")
-        fig_bar = px.bar(
-            prices_df,
-            x='price',
-            y='market',
-            orientation='h',
-            color='region',
-            color_discrete_map={'Europe': '#3b82f6', 'Americas': '#22c55e', 'Asia': '#f59e0b'}
-        )
-        fig_bar.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                             yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig_bar, use_container_width=True)
+        global_prices_chart()
     
     # Top Insight
     if insights:
@@ -267,14 +304,12 @@ with tab3:
     with col2:
         st.subheader("📊 Monte Carlo Distribution")
         col_a, col_b, col_c = st.columns(3)
-        col_a.metric("P5 (Best)", f"${mc['p5']}B", delta_color="normal")
-        col_b.metric("P50 (Median)", f"${mc['p50']}B")
-        col_c.metric("P95 (Worst)", f"${mc['p95']}B", delta_color="inverse")
+        col_a.metric("P5 (Best)", f"${mc.p5}B", delta_color="normal")
+        col_b.metric("P50 (Median)", f"${mc.p50}B")
+        col_c.metric("P95 (Worst)", f"${mc.p95}B", delta_color="inverse")
         
         # Distribution visualization
-        mc_full = [13.1 * (carbon_price/50) * (1+(np.random.random()-0.5)*0.6) * PATHWAY_MULT[pathway] * 
-                   (1+(np.random.random()-0.5)*0.4) * (10/discount_rate) for _ in range(1000)]
-        fig_hist = px.histogram(mc_full, nbins=30, color_discrete_sequence=['#f59e0b'])
+        fig_hist = px.histogram(mc.simulations, nbins=30, color_discrete_sequence=['#f59e0b'])
         fig_hist.update_layout(paper_bgcolor='rgba(0,0,0,0)', showlegend=False,
                               xaxis_title="Liability ($B)", yaxis_title="Frequency")
         st.plotly_chart(fig_hist, use_container_width=True)
@@ -290,6 +325,20 @@ with tab3:
     fig_payback.add_hline(y=0, line_dash="dash", line_color="red")
     fig_payback.update_layout(paper_bgcolor='rgba(0,0,0,0)')
     st.plotly_chart(fig_payback, use_container_width=True)
+    
+    # Optimizer
+    st.subheader("🧭 Optimal Fund Allocation")
+    fund = st.slider("Transition Fund ($B)", 1.0, 30.0, 15.0, 0.5,
+                     help="Capital budget for retirements, CCUS retrofits and efficiency upgrades")
+    opt = optimize_transition_fund(carbon_price, discount_rate, pathway, fund)
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("Capex Used", f"${opt.capex:.1f}B", f"of ${fund}B")
+    col_b.metric("Liability Avoided", f"${opt.avoided_liability:.1f}B", delta_color="normal")
+    col_c.metric("Residual Liability", f"${opt.optimized_liability:.1f}B", delta_color="inverse")
+    if not opt.proven_optimal:
+        st.caption(f"Within {opt.gap:.3%} of the best possible allocation")
+    actions = opt.plan[opt.plan['action'] != 'keep'].sort_values('capex', ascending=False)
+    st.dataframe(actions.round(2), use_container_width=True, hide_index=True)
 
 with tab4:
     st.subheader("👥 Stakeholder Perspectives")
@@ -0,0 +1,235 @@
+"""
+Compute Backends
+Liability kernel shared by CarbonModel and the dashboards
+"""
+
+import os
+import warnings
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+
+class LiabilityKernel(ABC):
+    """
+    Liability arithmetic with a pluggable implementation
+
+    L = base × (price / 50) × pathway_mult × (10 / rate)
+    draw = L × (1 + (u1 - 0.5) × price_var) × (1 + (u2 - 0.5) × emission_var)
+    facility j = L × w_j × (1 + (u1 - 0.5) × price_var) × (1 + β_j (u2 - 0.5) × emission_var)
+
+    Uniforms are consumed in (u1, u2) order per draw from a NumPy
+    Generator, so every backend yields identical draws for a given seed.
+    Draws are computed in float64 and stored at the precision of `out`
+    (float32 or float64).
+    """
+
+    name = "base"
+
+    def scale(self, base: float, price, rate, mult):
+        """Deterministic liability (scalars or arrays)"""
+        return base * (price / 50) * mult * (10 / rate)
+
+    @abstractmethod
+    def draws(self, rng: np.random.Generator, n: int, scale: float,
+              price_variance: float, emission_variance: float,
+              out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+        """Monte Carlo liability draws (written into `out` if given)"""
+
+    @abstractmethod
+    def draw_matrix(self, rng: np.random.Generator, n: int, scale: float,
+                    price_variance: float, emission_variance: float, weights: np.ndarray,
+                    exposure: Optional[np.ndarray] = None,
+                    out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+        """
+        Draws split across facilities with weights `w` and emission exposure `β`
+
+        Consumes the generator exactly like `draws()`. Row sums match the
+        scalar draws for the same seed when `w` sums to 1 and `w · β` = 1
+        (β defaults to 1 for every facility).
+        """
+
+    @abstractmethod
+    def moments(self, rng: np.random.Generator, n: int, scale: float,
+                price_variance: float, emission_variance: float) -> Tuple[float, float]:
+        """Mean and standard deviation of `n` draws without storing them"""
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+def check_dtype(dtype) -> np.dtype:
+    """Supported simulation precisions: float32 and float64"""
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"Unsupported dtype {dtype}. Choose float32 or float64")
+    return dtype
+
+
+def output_buffer(shape: Union[int, Tuple[int, ...]], out: Optional[np.ndarray],
+                  dtype=np.float64) -> np.ndarray:
+    """Validate a caller-supplied buffer or allocate one"""
+    shape = (int(shape),) if np.isscalar(shape) else tuple(shape)
+    if out is None:
+        return np.empty(shape, dtype=check_dtype(dtype))
+    if out.shape != shape:
+        raise ValueError(f"out must have shape {shape}, got {out.shape}")
+    check_dtype(out.dtype)
+    return out
+
+
+class NumpyBackend(LiabilityKernel):
+    """Vectorized NumPy implementation (default)"""
+
+    name = "numpy"
+    block_size = 1 << 18  # draws per block; bounds float64 temporaries
+
+    def draws(self, rng, n, scale, price_variance, emission_variance, out=None,
+              dtype=np.float64):
+        out = output_buffer(n, out, dtype)
+        for start in range(0, n, self.block_size):
+            m = min(self.block_size, n - start)
+            u = rng.random((m, 2))
+            p_var = 1 + (u[:, 0] - 0.5) * price_variance
+            e_var = 1 + (u[:, 1] - 0.5) * emission_variance
+            np.multiply(scale * p_var, e_var, out=out[start:start + m])
+        return out
+
+    def draw_matrix(self, rng, n, scale, price_variance, emission_variance, weights,
+                    exposure=None, out=None, dtype=np.float64):
+        weights = np.asarray(weights, dtype=np.float64)
+        exposure = np.ones_like(weights) if exposure is None else np.asarray(exposure, dtype=np.float64)
+        out = output_buffer((n, len(weights)), out, dtype)
+        for start in range(0, n, self.block_size):
+            m = min(self.block_size, n - start)
+            u = rng.random((m, 2))
+            p_var = scale * (1 + (u[:, 0] - 0.5) * price_variance)
+            e_var = 1 + np.outer((u[:, 1] - 0.5) * emission_variance, exposure)
+            np.multiply(p_var[:, None] * weights[None, :], e_var, out=out[start:start + m])
+        return out
+
+    def moments(self, rng, n, scale, price_variance, emission_variance):
+        # Per-block moments merged with Chan's update; memory stays at one block
+        count, mean, m2 = 0, 0.0, 0.0
+        for start in range(0, n, self.block_size):
+            d = self.draws(rng, min(self.block_size, n - start), scale,
+                           price_variance, emission_variance)
+            b_mean = float(d.mean())
+            b_m2 = float(np.square(d - b_mean).sum())
+            delta = b_mean - mean
+            total = count + len(d)
+            mean += delta * len(d) / total
+            m2 += b_m2 + delta * delta * count * len(d) / total
+            count = total
+        return mean, float(np.sqrt(m2 / n))
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _jit_draws(rng, scale, price_variance, emission_variance, out):
+        for i in range(out.shape[0]):
+            p_var = 1 + (rng.random() - 0.5) * price_variance
+            e_var = 1 + (rng.random() - 0.5) * emission_variance
+            out[i] = scale * p_var * e_var
+        return out
+
+    @numba.njit(cache=True)
+    def _jit_draw_matrix(rng, scale, price_variance, emission_variance, weights, exposure, out):
+        for i in range(out.shape[0]):
+            x = scale * (1 + (rng.random() - 0.5) * price_variance)
+            e = (rng.random() - 0.5) * emission_variance
+            for j in range(weights.shape[0]):
+                out[i, j] = x * weights[j] * (1 + exposure[j] * e)
+        return out
+
+    @numba.njit(cache=True)
+    def _jit_moments(rng, n, scale, price_variance, emission_variance):
+        # Welford's update: one pass, no intermediate arrays
+        mean = 0.0
+        m2 = 0.0
+        for i in range(n):
+            p_var = 1 + (rng.random() - 0.5) * price_variance
+            e_var = 1 + (rng.random() - 0.5) * emission_variance
+            x = scale * p_var * e_var
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+        return mean, np.sqrt(m2 / n)
+
+
+class NumbaBackend(LiabilityKernel):
+    """
+    Numba-JIT implementation
+
+    Fuses the random draws, multiplication and reduction into a single
+    compiled loop, so `draw_matrix()` and `moments()` run without any
+    temporaries.
+    """
+
+    name = "numba"
+
+    def __init__(self):
+        if numba is None:
+            raise ImportError("numba is not installed")
+
+    def draws(self, rng, n, scale, price_variance, emission_variance, out=None,
+              dtype=np.float64):
+        out = output_buffer(n, out, dtype)
+        return _jit_draws(rng, float(scale), float(price_variance),
+                          float(emission_variance), out)
+
+    def draw_matrix(self, rng, n, scale, price_variance, emission_variance, weights,
+                    exposure=None, out=None, dtype=np.float64):
+        weights = np.ascontiguousarray(weights, dtype=np.float64)
+        exposure = (np.ones_like(weights) if exposure is None
+                    else np.ascontiguousarray(exposure, dtype=np.float64))
+        out = output_buffer((n, len(weights)), out, dtype)
+        return _jit_draw_matrix(rng, float(scale), float(price_variance),
+                                float(emission_variance), weights, exposure, out)
+
+    def moments(self, rng, n, scale, price_variance, emission_variance):
+        mean, std = _jit_moments(rng, int(n), float(scale), float(price_variance),
+                                 float(emission_variance))
+        return float(mean), float(std)
+
+
+BACKENDS: Dict[str, type] = {
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+
+def available_backends() -> list:
+    """Backends usable in this environment"""
+    return [name for name in BACKENDS if name != "numba" or numba is not None]
+
+
+def get_backend(name: Union[str, LiabilityKernel, None] = None) -> LiabilityKernel:
+    """
+    Select a compute backend at runtime
+
+    Args:
+        name: numpy|numba|auto (default: $CARBON_BACKEND or numpy).
+            `auto` prefers numba when installed.
+
+    Returns:
+        LiabilityKernel instance; falls back to NumPy with a warning if
+        numba is requested but unavailable
+    """
+    if isinstance(name, LiabilityKernel):
+        return name
+    name = (name or os.environ.get("CARBON_BACKEND") or "numpy").lower()
+    if name == "auto":
+        name = "numba" if numba is not None else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Invalid backend. Choose from: {list(BACKENDS) + ['auto']}")
+    if name == "numba" and numba is None:
+        warnings.warn("numba is not installed; falling back to the numpy backend")
+        name = "numpy"
+    return BACKENDS[name]()
@@ -0,0 +1,67 @@
+"""
+Backend Benchmark
+Times the NumPy and Numba liability kernels and checks they agree
+
+Usage:
+    python benchmarks/bench_backends.py [n_draws] [seed]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backends import available_backends, get_backend
+
+SCALE = 13.1  # $B, base scenario
+N_FACILITIES = 23
+PRICE_VARIANCE = 0.6
+EMISSION_VARIANCE = 0.4
+
+
+def best_of(fn, repeat=3):
+    """Best wall-clock time of `repeat` runs and the last result"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(n: int = 10_000_000, seed: int = 42):
+    print(f"Backends: {available_backends()} | n={n:,} | seed={seed}")
+    draws, moments = {}, {}
+    weights = np.full(N_FACILITIES, 1 / N_FACILITIES)
+    m = n // N_FACILITIES
+    for name in available_backends():
+        kernel = get_backend(name)
+        kernel.draws(np.random.default_rng(seed), 10, SCALE, PRICE_VARIANCE, EMISSION_VARIANCE)  # JIT warm-up
+        kernel.draw_matrix(np.random.default_rng(seed), 10, SCALE, PRICE_VARIANCE, EMISSION_VARIANCE,
+                           weights)
+        out = np.empty(n)
+        matrix = np.empty((m, N_FACILITIES))
+        t_draws, draws[name] = best_of(lambda: kernel.draws(
+            np.random.default_rng(seed), n, SCALE, PRICE_VARIANCE, EMISSION_VARIANCE, out=out).copy())
+        t_matrix, _ = best_of(lambda: kernel.draw_matrix(
+            np.random.default_rng(seed), m, SCALE, PRICE_VARIANCE, EMISSION_VARIANCE, weights,
+            out=matrix))
+        t_moments, moments[name] = best_of(lambda: kernel.moments(
+            np.random.default_rng(seed), n, SCALE, PRICE_VARIANCE, EMISSION_VARIANCE))
+        print(f"  {name:6s} draws: {t_draws * 1e3:8.1f} ms   "
+              f"draw_matrix: {t_matrix * 1e3:8.1f} ms   "
+              f"moments: {t_moments * 1e3:8.1f} ms   mean={moments[name][0]:.6f} std={moments[name][1]:.6f}")
+
+    if len(draws) > 1:
+        identical = np.array_equal(draws["numpy"], draws["numba"])
+        close = np.allclose(moments["numpy"], moments["numba"], rtol=1e-9)
+        print(f"Identical draws: {identical} | moments agree: {close}")
+        if not (identical and close):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,51 @@
+"""
+Optimizer Benchmark
+Times the fleet optimizer on synthetic fleets of increasing size, then
+compares serial and parallel search at an equal node budget
+
+Usage:
+    python benchmarks/bench_optimizer.py [n_workers] [gap_tol]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from optimizer import optimize_fleet, synthetic_fleet
+
+EQUAL_WORK_FLEET = 10_000
+EQUAL_WORK_NODES = 2_000
+
+
+def timed(fleet, budget, **kwargs):
+    start = time.perf_counter()
+    result = optimize_fleet(fleet, fleet['liability'].sum(), budget, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(n_workers: int = 1, gap_tol: float = 1e-4):
+    print(f"n_workers={n_workers} | gap_tol={gap_tol}")
+    for n in (100, 1_000, 10_000, 100_000):
+        fleet = synthetic_fleet(n, seed=0)
+        budget = 0.05 * n  # $B, scales with fleet size
+        elapsed, result = timed(fleet, budget, n_workers=n_workers, gap_tol=gap_tol)
+        print(f"  {n:>7,} refineries: {elapsed:7.3f} s  capex=${result.capex:,.1f}B  "
+              f"avoided=${result.avoided_liability:,.1f}B  nodes={result.nodes:,}  "
+              f"gap={result.gap:.2e}")
+
+    # Exact search stopped at the same node limit: time per node is comparable
+    if n_workers > 1:
+        fleet = synthetic_fleet(EQUAL_WORK_FLEET, seed=0)
+        print(f"Equal node budget ({EQUAL_WORK_NODES:,} nodes, {EQUAL_WORK_FLEET:,} refineries, "
+              f"gap_tol=0, {os.cpu_count()} CPUs)")
+        for workers in (1, n_workers):
+            elapsed, result = timed(fleet, 0.05 * EQUAL_WORK_FLEET, n_workers=workers,
+                                    gap_tol=0, max_nodes=EQUAL_WORK_NODES)
+            print(f"  n_workers={workers}: {elapsed:7.3f} s  nodes={result.nodes:,}  "
+                  f"{result.nodes / elapsed:8.0f} nodes/s  gap={result.gap:.2e}")
+
+
+if __name__ == "__main__":
+    main(*(cast(a) for cast, a in zip((int, float), sys.argv[1:3])))
@@ -6,7 +6,10 @@ Python library for carbon liability analysis
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+
+from backends import LiabilityKernel, check_dtype, get_backend
+from simulation_store import SimulationStore, DEFAULT_CHUNK_SIZE, tail_rank
 
 __version__ = "6.0.0"
 __author__ = "Based on research by Bosco Chiramel"
@@ -65,6 +68,24 @@ class MonteCarloResult:
     mean: float
     std: float
     simulations: np.ndarray
+    
+    def to_arrow(self):
+        """Simulations as a pyarrow Array sharing the NumPy buffer"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow() requires pyarrow: pip install pyarrow") from None
+        return pa.array(self.simulations)
+
+@dataclass
+class RiskMetrics:
+    """Tail-risk metrics with per-refinery Euler contributions"""
+    levels: Tuple[float, ...]
+    var: Dict[float, float]
+    cvar: Dict[float, float]
+    var_contributions: pd.DataFrame
+    cvar_contributions: pd.DataFrame
+    simulations: np.ndarray
 
 class CarbonModel:
     """
@@ -74,13 +95,19 @@ class CarbonModel:
         model = CarbonModel()
         liability = model.calculate_liability(50, 10, 'Aggressive')
         mc = model.monte_carlo(1000)
+        
+        fast = CarbonModel(backend='numba')  # falls back to numpy if missing
+        lean = CarbonModel(dtype='float32')  # halves simulation memory
     """
     
     BASE_LIABILITY = 13.1  # $B at $50/t, 10% rate, Aggressive pathway
     
-    def __init__(self):
+    def __init__(self, backend: Union[str, LiabilityKernel, None] = None,
+                 dtype=np.float64):
         self.refineries = pd.DataFrame(REFINERIES)
         self.scenario = Scenario()
+        self.backend: LiabilityKernel = get_backend(backend)
+        self.dtype = check_dtype(dtype)
     
     def set_scenario(self, carbon_price: float = 50, discount_rate: float = 10, 
                      pathway: str = "Aggressive") -> 'CarbonModel':
@@ -88,6 +115,25 @@ class CarbonModel:
         self.scenario = Scenario(carbon_price, discount_rate, pathway)
         return self
     
+    def use_feed_price(self, feed, market: str = "EU ETS",
+                       fx_rate: Optional[float] = None) -> 'CarbonModel':
+        """
+        Set the scenario carbon price from a live price feed
+        
+        Args:
+            feed: price_feed.PriceFeed (anything with `latest(market)`)
+            market: Market whose latest quote becomes the carbon price
+            fx_rate: $ per unit of the quote currency; required unless the
+                quote is already in $
+        """
+        quote = feed.latest(market)
+        if fx_rate is None:
+            if quote.currency != "$":
+                raise ValueError(f"{market} is quoted in {quote.currency}; pass fx_rate to convert to $")
+            fx_rate = 1.0
+        return self.set_scenario(quote.price * fx_rate, self.scenario.discount_rate,
+                                 self.scenario.pathway)
+    
     def calculate_liability(self, carbon_price: Optional[float] = None,
                            discount_rate: Optional[float] = None,
                            pathway: Optional[str] = None) -> float:
@@ -107,11 +153,19 @@ class CarbonModel:
         path = pathway or self.scenario.pathway
         
         mult = PATHWAY_MULT.get(path, 1.0)
-        return round(self.BASE_LIABILITY * (price / 50) * mult * (10 / rate), 1)
+        return round(self.backend.scale(self.BASE_LIABILITY, price, rate, mult), 1)
+    
+    def _scenario_scale(self) -> float:
+        """Unrounded deterministic liability for the current scenario"""
+        return self.backend.scale(self.BASE_LIABILITY, self.scenario.carbon_price,
+                                  self.scenario.discount_rate,
+                                  PATHWAY_MULT[self.scenario.pathway])
     
     def monte_carlo(self, n_simulations: int = 1000,
                    price_variance: float = 0.6,
-                   emission_variance: float = 0.4) -> MonteCarloResult:
+                   emission_variance: float = 0.4,
+                   seed: Optional[int] = None,
+                   out: Optional[np.ndarray] = None) -> MonteCarloResult:
         """
         Run Monte Carlo simulation
         
@@ -119,36 +173,245 @@ class CarbonModel:
             n_simulations: Number of iterations
             price_variance: Price uncertainty (±%)
             emission_variance: Emission uncertainty (±%)
+            seed: RNG seed
+            out: Preallocated (n_simulations,) float32/float64 buffer; the
+                sorted draws are written into it and returned as-is
             
         Returns:
             MonteCarloResult with percentiles
         """
-        results = []
-        for _ in range(n_simulations):
-            p_var = 1 + (np.random.random() - 0.5) * price_variance
-            e_var = 1 + (np.random.random() - 0.5) * emission_variance
-            
-            liability = (self.BASE_LIABILITY * 
-                        (self.scenario.carbon_price / 50) * 
-                        p_var * 
-                        PATHWAY_MULT[self.scenario.pathway] * 
-                        e_var * 
-                        (10 / self.scenario.discount_rate))
-            results.append(liability)
-        
-        results = np.array(sorted(results))
+        rng = np.random.default_rng(seed)
+        results = self.backend.draws(rng, n_simulations, self._scenario_scale(),
+                                     price_variance, emission_variance,
+                                     out=out, dtype=self.dtype)
+        results.sort()
+        p5, p25, p50, p75, p95 = np.percentile(results, [5, 25, 50, 75, 95])
         
         return MonteCarloResult(
-            p5=round(np.percentile(results, 5), 1),
-            p25=round(np.percentile(results, 25), 1),
-            p50=round(np.percentile(results, 50), 1),
-            p75=round(np.percentile(results, 75), 1),
-            p95=round(np.percentile(results, 95), 1),
-            mean=round(np.mean(results), 1),
-            std=round(np.std(results), 1),
+            p5=round(float(p5), 1),
+            p25=round(float(p25), 1),
+            p50=round(float(p50), 1),
+            p75=round(float(p75), 1),
+            p95=round(float(p95), 1),
+            mean=round(float(np.mean(results, dtype=np.float64)), 1),
+            std=round(float(np.std(results, dtype=np.float64)), 1),
             simulations=results
         )
     
+    def facility_weights(self) -> np.ndarray:
+        """Each refinery's share of fleet liability (base `liability` column)"""
+        weights = self.refineries['liability'].to_numpy(dtype=np.float64)
+        return weights / weights.sum()
+    
+    def emission_exposure(self) -> np.ndarray:
+        """
+        Per-refinery sensitivity to the sector emission shock
+        
+        Older units run less predictably, so exposure scales with age
+        relative to the liability-weighted fleet average (capped to
+        0.5-2×). The weighted mean exposure is 1, which keeps the fleet
+        total on the monte_carlo() distribution.
+        """
+        weights = self.facility_weights()
+        age = self.refineries['age'].to_numpy(dtype=np.float64)
+        exposure = np.clip(age / (weights @ age), 0.5, 2.0)
+        return exposure / (weights @ exposure)
+    
+    def facility_simulations(self, n_simulations: int = 10000,
+                             price_variance: float = 0.6,
+                             emission_variance: float = 0.4,
+                             seed: Optional[int] = None,
+                             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simulate per-refinery liabilities
+        
+        Price and emission shocks are sector-wide: every refinery sees the
+        same draw, scaled by its liability weight, with the emission shock
+        amplified or damped by its `emission_exposure()`. The fleet total
+        follows exactly the distribution of monte_carlo() (same draws for
+        the same seed and n).
+        
+        Args:
+            n_simulations: Number of iterations
+            price_variance: Price uncertainty (±%)
+            emission_variance: Emission uncertainty (±%)
+            seed: RNG seed
+            out: Preallocated (n_simulations, n_refineries) buffer to fill
+            
+        Returns:
+            Array of shape (n_simulations, n_refineries) in $B, at the
+            model's precision (or `out`'s), filled in place
+        """
+        rng = np.random.default_rng(seed)
+        return self.backend.draw_matrix(rng, n_simulations, self._scenario_scale(),
+                                        price_variance, emission_variance,
+                                        self.facility_weights(), self.emission_exposure(),
+                                        out=out, dtype=self.dtype)
+    
+    def moments(self, n_simulations: int = 1000,
+                price_variance: float = 0.6,
+                emission_variance: float = 0.4,
+                seed: Optional[int] = None) -> Tuple[float, float]:
+        """
+        Mean and standard deviation of the Monte Carlo liability
+        
+        Streams the draws through the backend instead of storing them, so
+        memory stays constant however large `n_simulations` is. Same draws
+        as monte_carlo() for the same seed and n.
+        
+        Returns:
+            (mean, std) in $B, unrounded
+        """
+        rng = np.random.default_rng(seed)
+        return self.backend.moments(rng, n_simulations, self._scenario_scale(),
+                                    price_variance, emission_variance)
+    
+    def risk_metrics(self, n_simulations: int = 10000,
+                     levels: Tuple[float, ...] = (0.95, 0.99, 0.995),
+                     price_variance: float = 0.6,
+                     emission_variance: float = 0.4,
+                     seed: Optional[int] = None,
+                     simulations: Optional[np.ndarray] = None) -> RiskMetrics:
+        """
+        Value-at-Risk, Expected Shortfall and per-refinery contributions
+        
+        Tail thresholds are found with `np.argpartition` (O(n) selection)
+        rather than a full sort. ES contributions are the Euler allocations
+        E[L_i | L >= VaR]; VaR contributions average L_i over the draws
+        adjacent to VaR and are rescaled to sum to VaR. Contributions come
+        from one matrix product of tail masks with the simulations.
+        
+        Facility liabilities are linear in two factors per draw (the price
+        shock alone, and the full draw), so unless a matrix is supplied
+        only those n × 2 factors are simulated and the tail averages are
+        mapped to refineries through their weights and emission exposure.
+        
+        Args:
+            n_simulations: Number of iterations
+            levels: Confidence levels, e.g. (0.95, 0.99, 0.995)
+            price_variance: Price uncertainty (±%)
+            emission_variance: Emission uncertainty (±%)
+            seed: RNG seed
+            simulations: Precomputed (n, n_refineries) matrix to reuse
+            
+        Returns:
+            RiskMetrics with VaR/ES by level and contribution tables
+        """
+        levels = tuple(levels)
+        if any(not 0 < a < 1 for a in levels):
+            raise ValueError("Confidence levels must be in (0, 1)")
+        if simulations is None:
+            # Column 0: L × price shock; column 1: the monte_carlo() draw
+            rng = np.random.default_rng(seed)
+            simulations = self.backend.draw_matrix(rng, n_simulations, self._scenario_scale(),
+                                                   price_variance, emission_variance,
+                                                   np.ones(2), np.array([0.0, 1.0]),
+                                                   dtype=self.dtype)
+            total = simulations[:, 1]
+            weights, exposure = self.facility_weights(), self.emission_exposure()
+            loadings = np.vstack([weights * (1 - exposure), weights * exposure])
+        else:
+            total = simulations.sum(axis=1)
+            loadings = None
+        n = len(simulations)
+        
+        ks = np.array([tail_rank(a, n) for a in levels])
+        window = max(1, n // 200)
+        kth = np.unique(np.concatenate([ks, np.maximum(ks - window, 0),
+                                        np.minimum(ks + window, n - 1)]))
+        order = np.argpartition(total, kth)
+        
+        masks = np.zeros((2 * len(levels), n), dtype=simulations.dtype)
+        for j, k in enumerate(ks):
+            masks[j, order[k:]] = 1
+            masks[len(levels) + j, order[max(k - window, 0):min(k + window, n - 1) + 1]] = 1
+        counts = masks.sum(axis=1, keepdims=True)
+        contrib = (masks @ simulations) / counts
+        if loadings is not None:
+            contrib = contrib @ loadings
+        
+        var = {a: float(total[order[k]]) for a, k in zip(levels, ks)}
+        cvar = {a: float(c) for a, c in zip(levels, contrib[:len(levels)].sum(axis=1))}
+        var_contrib = contrib[len(levels):]
+        var_contrib = var_contrib * (np.array([var[a] for a in levels]) /
+                                     var_contrib.sum(axis=1))[:, None]
+        
+        names = self.refineries['name']
+        return RiskMetrics(
+            levels=levels,
+            var=var,
+            cvar=cvar,
+            var_contributions=pd.DataFrame(var_contrib.T, index=names, columns=list(levels)),
+            cvar_contributions=pd.DataFrame(contrib[:len(levels)].T, index=names,
+                                            columns=list(levels)),
+            simulations=np.ascontiguousarray(total)
+        )
+    
+    def monte_carlo_to_store(self, path: str, n_simulations: int = 1000,
+                             price_variance: float = 0.6,
+                             emission_variance: float = 0.4,
+                             seed: Optional[int] = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             dtype=None) -> SimulationStore:
+        """
+        Run Monte Carlo simulation and stream raw draws to disk
+        
+        Draws are generated and written chunk by chunk into a memory-mapped
+        `.npy` file, so runs far larger than RAM can be archived and queried
+        later via SimulationStore.open().
+        
+        Args:
+            path: Target `.npy` file (metadata goes to a sibling `.json`)
+            n_simulations: Number of iterations
+            price_variance: Price uncertainty (±%)
+            emission_variance: Emission uncertainty (±%)
+            seed: RNG seed (generated and recorded if omitted)
+            chunk_size: Draws generated per chunk
+            dtype: Storage dtype (default: model precision)
+            
+        Returns:
+            SimulationStore over the written draws
+        """
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2**63)
+        metadata = {
+            "scenario": {
+                "carbon_price": self.scenario.carbon_price,
+                "discount_rate": self.scenario.discount_rate,
+                "pathway": self.scenario.pathway
+            },
+            "seed": seed,
+            "price_variance": price_variance,
+            "emission_variance": emission_variance,
+            "version": __version__
+        }
+        dtype = self.dtype if dtype is None else check_dtype(dtype)
+        store = SimulationStore.create(path, n_simulations, metadata, dtype, chunk_size)
+        
+        rng = np.random.default_rng(seed)
+        scale = self._scenario_scale()
+        for start in range(0, n_simulations, chunk_size):
+            n = min(chunk_size, n_simulations - start)
+            self.backend.draws(rng, n, scale, price_variance, emission_variance,
+                               out=store.draws[start:start + n])
+        store.flush()
+        return store
+    
+    def optimize_investments(self, budget: float = 15.0, **kwargs):
+        """
+        Choose per-refinery actions (keep, efficiency, CCUS, retire) within
+        a capital budget to minimize expected liability under the scenario
+        
+        Args:
+            budget: Capital budget in $B
+            **kwargs: Passed to optimizer.optimize_fleet (n_workers, ...)
+            
+        Returns:
+            optimizer.OptimizationResult
+        """
+        from optimizer import optimize_fleet
+        return optimize_fleet(self.refineries, self._scenario_scale(), budget, **kwargs)
+    
     def sensitivity_analysis(self, factor: str = "carbon_price", 
                             range_pct: float = 30) -> pd.DataFrame:
         """
@@ -248,28 +511,44 @@ class CarbonModel:
         return insights
     
     def get_refinery_data(self, filter_type: Optional[str] = None,
-                         filter_risk: Optional[str] = None) -> pd.DataFrame:
+                         filter_risk: Optional[str] = None,
+                         copy: bool = True) -> pd.DataFrame:
         """
         Get refinery data with optional filters
         
         Args:
             filter_type: PSU|Private
             filter_risk: AAA|A|BBB|BB|B
+            copy: If False and no filter is given, return the model's own
+                DataFrame instead of a copy (treat it as read-only)
             
         Returns:
             Filtered DataFrame
         """
-        df = self.refineries.copy()
+        df = self.refineries
+        mask = np.ones(len(df), dtype=bool)
         if filter_type:
-            df = df[df['type'] == filter_type]
+            mask &= (df['type'] == filter_type).to_numpy()
         if filter_risk:
-            df = df[df['risk'] == filter_risk]
-        return df
+            mask &= (df['risk'] == filter_risk).to_numpy()
+        if mask.all():
+            return df.copy() if copy else df
+        return df[mask]
     
-    def summary(self) -> Dict:
-        """Get scenario summary"""
+    def summary(self, n_simulations: int = 1000, seed: Optional[int] = None,
+                mc: Optional[MonteCarloResult] = None,
+                risk: Optional[RiskMetrics] = None) -> Dict:
+        """
+        Get scenario summary (seeded for reproducible Monte Carlo fields)
+        
+        Pass `mc` and/or `risk` when they are already computed for this
+        scenario to skip rerunning them.
+        """
         liability = self.calculate_liability()
-        mc = self.monte_carlo()
+        if mc is None:
+            mc = self.monte_carlo(n_simulations, seed=seed)
+        if risk is None:
+            risk = self.risk_metrics(n_simulations, seed=seed)
         
         return {
             "scenario": {
@@ -284,6 +563,10 @@ class CarbonModel:
                 "p95": mc.p95,
                 "mean": mc.mean
             },
+            "risk": {
+                f"{a:.1%}": {"var": round(risk.var[a], 1), "cvar": round(risk.cvar[a], 1)}
+                for a in risk.levels
+            },
             "refineries": {
                 "total": len(self.refineries),
                 "psu": len(self.refineries[self.refineries['type'] == 'PSU']),
@@ -0,0 +1,347 @@
+"""
+Transition Investment Optimizer
+Chooses per-refinery actions under a capital budget
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Capex in $B per MMTPA of capacity; reduction = share of liability avoided
+ACTIONS = {
+    "keep": {"capex": 0.0, "reduction": 0.0},
+    "efficiency": {"capex": 0.04, "reduction": 0.18},
+    "ccus": {"capex": 0.30, "reduction": 0.60},
+    "retire": {"capex": 0.05, "reduction": 1.0},
+}
+ACTION_NAMES = list(ACTIONS)
+
+# Retirement also writes off remaining book value, which runs out at this age
+STRANDED_VALUE = 0.8  # $B per MMTPA for a new refinery
+ASSET_LIFE = 60  # years
+
+# Incumbent liability shared by all search processes (set per worker)
+_shared_best = None
+
+
+@dataclass
+class OptimizationResult:
+    """Optimized fleet plan"""
+    plan: pd.DataFrame
+    budget: float
+    capex: float
+    baseline_liability: float
+    optimized_liability: float
+    gap: float = 0.0  # (liability - lower bound) / liability
+    nodes: int = 0  # branch-and-bound nodes explored
+
+    @property
+    def proven_optimal(self) -> bool:
+        """True if no plan can beat this one (gap closed)"""
+        return self.gap <= 1e-9
+
+    @property
+    def avoided_liability(self) -> float:
+        return self.baseline_liability - self.optimized_liability
+
+    def action_counts(self) -> dict:
+        return self.plan['action'].value_counts().reindex(ACTION_NAMES, fill_value=0).to_dict()
+
+
+def action_tables(refineries: pd.DataFrame, total_liability: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cost and residual liability of every action for every refinery
+
+    Args:
+        refineries: DataFrame with capacity, age and liability columns
+        total_liability: Fleet liability ($B) to allocate by liability weight
+
+    Returns:
+        (cost, residual) arrays of shape (n_refineries, n_actions) in $B
+    """
+    capacity = refineries['capacity'].to_numpy(dtype=np.float64)
+    age = refineries['age'].to_numpy(dtype=np.float64)
+    weights = refineries['liability'].to_numpy(dtype=np.float64)
+    expected = total_liability * weights / weights.sum()
+
+    capex = np.array([a["capex"] for a in ACTIONS.values()])
+    reduction = np.array([a["reduction"] for a in ACTIONS.values()])
+    cost = capacity[:, None] * capex[None, :]
+    retire = ACTION_NAMES.index("retire")
+    cost[:, retire] += capacity * STRANDED_VALUE * np.clip(1 - age / ASSET_LIFE, 0, 1)
+    residual = expected[:, None] * (1 - reduction[None, :])
+    return cost, residual
+
+
+def evaluate_portfolios(choices: np.ndarray, cost: np.ndarray,
+                        residual: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Capex and residual liability for a batch of portfolios
+
+    Args:
+        choices: (n_portfolios, n_refineries) action indices
+        cost, residual: Tables from action_tables()
+
+    Returns:
+        (capex, liability) arrays of shape (n_portfolios,)
+    """
+    choices = np.atleast_2d(choices)
+    rows = np.arange(cost.shape[0])[None, :]
+    return cost[rows, choices].sum(axis=1), residual[rows, choices].sum(axis=1)
+
+
+def _hull_steps(cost: np.ndarray, residual: np.ndarray) -> np.ndarray:
+    """
+    Upgrade steps along each refinery's lower convex hull, best first
+
+    Walks every refinery from `keep` towards the option with the best
+    marginal saving per $ (vectorized across refineries), then orders all
+    steps by that ratio. Chains stay in order, so any prefix of the result
+    is a valid portfolio and the LP relaxation is a fractional prefix.
+
+    Returns:
+        (n_steps, 4) array of refinery, action, cost, saving
+    """
+    n = cost.shape[0]
+    rows = np.arange(n)
+    current = np.zeros(n, dtype=np.int64)
+    steps = []
+    for depth in range(cost.shape[1] - 1):
+        d_cost = cost - cost[rows, current][:, None]
+        d_save = residual[rows, current][:, None] - residual
+        valid = (d_save > 0) & (d_cost >= 0)
+        slope = np.where(valid, d_save / np.maximum(d_cost, 1e-12), -np.inf)
+        best = slope.argmax(axis=1)
+        has = np.isfinite(slope[rows, best])
+        if not has.any():
+            break
+        f, a = rows[has], best[has]
+        steps.append(np.column_stack([f, a, d_cost[f, a], d_save[f, a],
+                                      slope[f, a], np.full(len(f), depth)]))
+        current[has] = a
+    if not steps:
+        return np.empty((0, 4))
+    steps = np.concatenate(steps)
+    return steps[np.lexsort((steps[:, 5], -steps[:, 4]))][:, :4]
+
+
+def _fill(choice, cost, residual, budget):
+    """Apply the best affordable single-refinery change until none helps"""
+    rows = np.arange(len(choice))
+    while True:
+        slack = budget - cost[rows, choice].sum()
+        d_cost = cost - cost[rows, choice][:, None]
+        d_save = residual[rows, choice][:, None] - residual
+        gain = np.where(d_cost <= slack + 1e-12, d_save, 0.0)
+        f, a = np.unravel_index(gain.argmax(), gain.shape)
+        if gain[f, a] <= 1e-12:
+            return choice
+        choice[f] = a
+
+
+def _relax(fixed, steps, cost, residual, budget):
+    """
+    LP relaxation at a branch-and-bound node
+
+    Args:
+        fixed: Action per refinery, -1 where still free
+
+    Returns:
+        (bound, portfolio, value, branch_refinery) where `portfolio` is the
+        integral prefix solution with liability `value`, and
+        `branch_refinery` is the fractional refinery (-1 if none)
+    """
+    rows = np.arange(len(fixed))
+    is_fixed = fixed >= 0
+    choice = np.where(is_fixed, fixed, 0)
+    room = budget - cost[rows[is_fixed], fixed[is_fixed]].sum()
+    free = steps[~is_fixed[steps[:, 0].astype(np.int64)]]
+    cum = np.cumsum(free[:, 2])
+    k = int(np.searchsorted(cum, room + 1e-12, side="right"))
+    taken = free[:k]
+    choice[taken[:, 0].astype(np.int64)] = taken[:, 1].astype(np.int64)
+    value = float(residual[rows, choice].sum())
+    if k == len(free):
+        return value, choice, value, -1
+    spare = room - (cum[k - 1] if k else 0.0)
+    bound = value - spare / free[k, 2] * free[k, 3]
+    return bound, choice, value, int(free[k, 0])
+
+
+def _init_worker(shared_best):
+    global _shared_best
+    _shared_best = shared_best
+
+
+def _incumbent(best_value):
+    """Best liability found by this process or any other"""
+    if _shared_best is None:
+        return best_value
+    return min(best_value, _shared_best.get_obj().value)
+
+
+def _publish(best_value):
+    if _shared_best is not None:
+        with _shared_best.get_lock():
+            if best_value < _shared_best.get_obj().value:
+                _shared_best.get_obj().value = best_value
+
+
+def _branch_and_bound(args):
+    """
+    Depth-first branch-and-bound over a list of root nodes (worker entry point)
+
+    Nodes are (parent_bound, fixed) pairs. Improvements are published to
+    the other processes, which prune against the best incumbent overall.
+
+    Returns:
+        (best_value, best_choice, lower, nodes) where `lower` is the
+        smallest bound among subtrees pruned within `gap_tol` or left
+        unexplored at the node limit (inf if the search was exact)
+    """
+    roots, steps, cost, residual, budget, best_value, best_choice, max_nodes, gap_tol = args
+    rows = np.arange(cost.shape[0])
+    stack = list(roots)
+    lower = np.inf
+    nodes = 0
+    while stack and nodes < max_nodes:
+        _, fixed = stack.pop()
+        nodes += 1
+        if cost[rows[fixed >= 0], fixed[fixed >= 0]].sum() > budget + 1e-12:
+            continue
+        bound, choice, value, branch = _relax(fixed, steps, cost, residual, budget)
+        incumbent = _incumbent(best_value)
+        if bound >= incumbent * (1 - gap_tol) - 1e-9:
+            lower = min(lower, bound)
+            continue
+        if value < incumbent - 1e-9:
+            choice = _fill(choice, cost, residual, budget)
+            best_value, best_choice = float(residual[rows, choice].sum()), choice
+            _publish(best_value)
+        if branch < 0:
+            continue
+        # Most promising child (lowest residual) is explored first
+        for a in np.argsort(-residual[branch]):
+            child = fixed.copy()
+            child[branch] = a
+            stack.append((bound, child))
+    if stack:
+        lower = min(lower, min(b for b, _ in stack))
+    return best_value, best_choice, lower, nodes
+
+
+def optimize_fleet(refineries: pd.DataFrame, total_liability: float,
+                   budget: float = 15.0, n_workers: Optional[int] = 1,
+                   max_nodes: int = 20000, gap_tol: float = 1e-4) -> OptimizationResult:
+    """
+    Choose keep / efficiency / CCUS / retire per refinery under a budget
+
+    A multiple-choice knapsack solved by branch-and-bound: each node's LP
+    relaxation is a fractional prefix of the refineries' convex-hull
+    upgrade steps (one vectorized pass), and the search branches on the
+    single fractional refinery. The hull greedy provides the first
+    incumbent. With `n_workers > 1` subtrees below the root are searched
+    in worker processes that share the incumbent and the node limit.
+
+    Args:
+        refineries: DataFrame with name, capacity, age, liability columns
+        total_liability: Expected fleet liability ($B) under the scenario
+        budget: Capital budget ($B)
+        n_workers: Processes for the tree search (None = all CPUs)
+        max_nodes: Total node limit; the best plan found is returned with
+            its remaining gap if it is reached
+        gap_tol: Relative optimality gap at which subtrees are pruned
+
+    Returns:
+        OptimizationResult with the per-refinery plan and the proven gap
+        between its liability and the best possible
+    """
+    if budget < 0:
+        raise ValueError("budget must be non-negative")
+    cost, residual = action_tables(refineries, total_liability)
+    rows = np.arange(cost.shape[0])
+    steps = _hull_steps(cost, residual)
+    n_workers = n_workers or os.cpu_count() or 1
+
+    root = np.full(cost.shape[0], -1, dtype=np.int64)
+    _, choice, _, _ = _relax(root, steps, cost, residual, budget)
+    best_choice = _fill(choice, cost, residual, budget)
+    best_value = float(residual[rows, best_choice].sum())
+
+    # Expand the top of the tree breadth-first to get work for each process
+    frontier = [(-np.inf, root)]
+    lower = np.inf
+    nodes = 0
+    while n_workers > 1 and 0 < len(frontier) < 4 * n_workers:
+        _, fixed = frontier.pop(0)
+        nodes += 1
+        if cost[rows[fixed >= 0], fixed[fixed >= 0]].sum() > budget + 1e-12:
+            continue
+        bound, choice, value, branch = _relax(fixed, steps, cost, residual, budget)
+        if value < best_value - 1e-9:
+            best_choice = _fill(choice, cost, residual, budget)
+            best_value = float(residual[rows, best_choice].sum())
+        if branch < 0:
+            continue
+        if bound >= best_value * (1 - gap_tol) - 1e-9:
+            lower = min(lower, bound)
+            continue
+        for a in range(cost.shape[1]):
+            child = fixed.copy()
+            child[branch] = a
+            frontier.append((bound, child))
+
+    k = min(n_workers, len(frontier))
+    per_worker = max(1, (max_nodes - nodes) // max(k, 1))
+    jobs = [(frontier[i::k], steps, cost, residual, budget, best_value, best_choice, per_worker,
+             gap_tol) for i in range(k)]
+    if len(jobs) > 1:
+        shared = multiprocessing.Value("d", best_value)
+        with ProcessPoolExecutor(len(jobs), initializer=_init_worker,
+                                 initargs=(shared,)) as pool:
+            results = list(pool.map(_branch_and_bound, jobs))
+    else:
+        results = [_branch_and_bound(job) for job in jobs]
+    for value, choice, job_lower, job_nodes in results:
+        lower = min(lower, job_lower)
+        nodes += job_nodes
+        if value < best_value:
+            best_value, best_choice = value, choice
+    gap = max(0.0, (best_value - lower) / best_value) if best_value > 0 and lower < best_value else 0.0
+
+    capex, liability = evaluate_portfolios(best_choice, cost, residual)
+    plan = refineries[['name', 'capacity', 'age']].copy()
+    plan['action'] = np.array(ACTION_NAMES)[best_choice]
+    plan['capex'] = cost[rows, best_choice]
+    plan['liability_before'] = residual[:, 0]
+    plan['liability_after'] = residual[rows, best_choice]
+    return OptimizationResult(
+        plan=plan.reset_index(drop=True),
+        budget=budget,
+        capex=float(capex[0]),
+        baseline_liability=float(residual[:, 0].sum()),
+        optimized_liability=float(liability[0]),
+        gap=float(gap),
+        nodes=nodes
+    )
+
+
+def synthetic_fleet(n: int, seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Resample the refinery table into an `n`-facility fleet (for scaling runs)
+    """
+    from carbon_liability import REFINERIES
+
+    rng = np.random.default_rng(seed)
+    base = pd.DataFrame(REFINERIES)
+    fleet = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    fleet['name'] = [f"{name} #{i}" for i, name in enumerate(fleet['name'])]
+    fleet['capacity'] *= rng.uniform(0.5, 1.5, n)
+    fleet['liability'] *= rng.uniform(0.5, 1.5, n)
+    fleet['age'] = np.maximum(1, fleet['age'] + rng.integers(-10, 11, n))
+    return fleet
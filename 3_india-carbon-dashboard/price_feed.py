@@ -0,0 +1,234 @@
+"""
+Carbon Price Feed
+Pluggable global carbon price sources with a shared TTL cache
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Fallback quotes (used when no live source is configured)
+DEFAULT_PRICES = [
+    {"market": "EU ETS", "price": 68.5, "currency": "€", "region": "Europe"},
+    {"market": "UK ETS", "price": 42.1, "currency": "£", "region": "Europe"},
+    {"market": "California", "price": 35.8, "currency": "$", "region": "Americas"},
+    {"market": "China", "price": 9.2, "currency": "¥", "region": "Asia"},
+    {"market": "Korea", "price": 8.5, "currency": "₩", "region": "Asia"},
+    {"market": "India (Est.)", "price": 20.0, "currency": "₹", "region": "Asia"},
+]
+
+DEFAULT_TTL = 60.0
+
+
+@dataclass
+class PriceQuote:
+    """Single market price quote"""
+    market: str
+    price: float
+    currency: str = "$"
+    region: str = ""
+    change_pct: Optional[float] = None
+
+
+def _parse_quotes(records: List[Dict]) -> List[PriceQuote]:
+    """Build quotes from a list of dicts, ignoring unknown keys"""
+    fields = PriceQuote.__dataclass_fields__
+    return [PriceQuote(**{k: v for k, v in r.items() if k in fields}) for r in records]
+
+
+class PriceFeedAdapter(ABC):
+    """
+    Price source interface
+
+    Subclasses implement `fetch()`; `fetch_async()` runs it in a worker
+    thread unless overridden by a natively async source.
+    """
+
+    @abstractmethod
+    def fetch(self) -> List[PriceQuote]:
+        """Fetch the current quotes"""
+
+    async def fetch_async(self) -> List[PriceQuote]:
+        return await asyncio.to_thread(self.fetch)
+
+
+class StaticPriceFeed(PriceFeedAdapter):
+    """Fixed quotes (offline fallback and tests)"""
+
+    def __init__(self, records: Optional[List[Dict]] = None):
+        self.quotes = _parse_quotes(records if records is not None else DEFAULT_PRICES)
+
+    def fetch(self) -> List[PriceQuote]:
+        return list(self.quotes)
+
+
+class FilePriceFeed(PriceFeedAdapter):
+    """Quotes read from a local JSON (list of records) or CSV file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> List[PriceQuote]:
+        if self.path.endswith(".csv"):
+            records = pd.read_csv(self.path).to_dict("records")
+        else:
+            with open(self.path) as f:
+                records = json.load(f)
+        return _parse_quotes(records)
+
+
+class HTTPPriceFeed(PriceFeedAdapter):
+    """Quotes from an HTTP endpoint returning a JSON list of records"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self) -> List[PriceQuote]:
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as resp:
+            records = json.loads(resp.read().decode("utf-8"))
+        if isinstance(records, dict):
+            records = records.get("prices", [])
+        return _parse_quotes(records)
+
+
+class PriceFeed:
+    """
+    TTL-cached, request-coalescing front for a price adapter
+
+    Concurrent callers that find the cache stale share one in-flight
+    fetch instead of each hitting the source. If a refresh fails, the
+    last good quotes (or `fallback` before any fetch has succeeded) keep
+    being served and the source is not retried until the TTL expires.
+
+    Example usage:
+        feed = PriceFeed(FilePriceFeed("prices.json"), ttl=30)
+        feed.latest("EU ETS").price
+    """
+
+    def __init__(self, adapter: PriceFeedAdapter, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic,
+                 fallback: Optional[List[Dict]] = None):
+        self.adapter = adapter
+        self.ttl = ttl
+        self.clock = clock
+        self.fetch_count = 0
+        self.version = 0
+        self.last_error: Optional[Exception] = None
+        self.fallback = _parse_quotes(fallback if fallback is not None else DEFAULT_PRICES)
+        self._quotes: Optional[List[PriceQuote]] = None
+        self._fetched_at = float("-inf")
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._quotes is not None and self.clock() - self._fetched_at < self.ttl
+
+    def get(self) -> List[PriceQuote]:
+        """Current quotes, refreshing at most once per TTL"""
+        if self.is_fresh:
+            return self._quotes
+        with self._lock:
+            if self.is_fresh:
+                return self._quotes
+            leader = self._inflight is None
+            if leader:
+                self._inflight = threading.Event()
+            event = self._inflight
+        if not leader:
+            event.wait()
+            return self._current()
+        try:
+            quotes = self.adapter.fetch()
+            self.fetch_count += 1
+            with self._lock:
+                if quotes != self._quotes:
+                    self.version += 1
+                self._quotes = quotes
+                self._fetched_at = self.clock()
+                self.last_error = None
+        except Exception as e:
+            with self._lock:
+                if self._quotes is None:
+                    self._quotes = list(self.fallback)
+                    self.version += 1
+                self._fetched_at = self.clock()
+                self.last_error = e
+        finally:
+            with self._lock:
+                self._inflight = None
+            event.set()
+        return self._current()
+
+    async def get_async(self) -> List[PriceQuote]:
+        """Async variant of get(); coalesces with sync callers too"""
+        if self.is_fresh:
+            return self._quotes
+        return await asyncio.to_thread(self.get)
+
+    async def poll(self, on_update: Callable[[List[PriceQuote]], None],
+                   interval: Optional[float] = None,
+                   stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Poll the source and call `on_update` whenever quotes change
+
+        Args:
+            on_update: Callback receiving the new quotes
+            interval: Seconds between polls (default: TTL)
+            stop: Event that ends the loop when set
+        """
+        interval = self.ttl if interval is None else interval
+        seen = None
+        while stop is None or not stop.is_set():
+            quotes = await self.get_async()
+            if self.version != seen:
+                seen = self.version
+                on_update(quotes)
+            await asyncio.sleep(interval)
+
+    def latest(self, market: str) -> PriceQuote:
+        """Latest quote for a market"""
+        for quote in self.get():
+            if quote.market == market:
+                return quote
+        raise KeyError(f"No quote for market: {market}")
+
+    def to_frame(self) -> pd.DataFrame:
+        """Current quotes as a DataFrame"""
+        return pd.DataFrame([asdict(q) for q in self.get()])
+
+    @property
+    def is_stale(self) -> bool:
+        """True while serving last good or fallback quotes after a failed fetch"""
+        return self.last_error is not None
+
+    def _current(self) -> List[PriceQuote]:
+        return self._quotes if self._quotes is not None else list(self.fallback)
+
+
+def feed_from_source(source: Optional[str] = None, ttl: float = DEFAULT_TTL) -> PriceFeed:
+    """
+    Build a PriceFeed from a source string
+
+    Args:
+        source: http(s) URL, path to a JSON/CSV file, or None for the
+            static fallback (default: $CARBON_PRICE_FEED)
+        ttl: Cache lifetime in seconds
+    """
+    source = source or os.environ.get("CARBON_PRICE_FEED")
+    if not source:
+        adapter = StaticPriceFeed()
+    elif source.startswith(("http://", "https://")):
+        adapter = HTTPPriceFeed(source)
+    else:
+        adapter = FilePriceFeed(source)
+    return PriceFeed(adapter, ttl)
@@ -29,6 +29,53 @@ const globalPrices = [
   { market: "India (Est.)", price: 20.0, currency: "₹", flag: "🇮🇳" },
 ];
 
+// Live prices: set REACT_APP_PRICE_FEED_URL to a JSON endpoint returning [{ market, price, currency, flag }]
+// (or { prices: [...] }, like the Python feed)
+const PRICE_FEED_URL = (typeof process !== 'undefined' && process.env && process.env.REACT_APP_PRICE_FEED_URL) || null;
+const PRICE_TTL_MS = 30000;
+
+// Accept a list of quotes or { prices: [...] }; anything else is a bad response
+const parseQuotes = (data) => {
+  const records = Array.isArray(data) ? data : data && Array.isArray(data.prices) ? data.prices : null;
+  const quotes = (records || []).filter(q => q && typeof q.market === "string" && Number.isFinite(q.price));
+  if (!quotes.length) throw new Error("Unexpected price feed response");
+  return quotes;
+};
+
+// One cache + one in-flight request shared by every price widget.
+// A failed refresh keeps the last good quotes and waits a full TTL to retry.
+const priceFeed = {
+  data: globalPrices, fetchedAt: 0, inflight: null, listeners: new Set(),
+  refresh(url, ttl) {
+    if (!url || Date.now() - this.fetchedAt < ttl) return Promise.resolve(this.data);
+    if (!this.inflight) {
+      this.inflight = fetch(url).then(r => {
+        if (!r.ok) throw new Error(`Price feed HTTP ${r.status}`);
+        return r.json();
+      }).then(parseQuotes).then(data => {
+        this.data = data;
+        this.listeners.forEach(fn => fn(data));
+        return data;
+      }).catch(() => this.data).finally(() => {
+        this.fetchedAt = Date.now();
+        this.inflight = null;
+      });
+    }
+    return this.inflight;
+  },
+};
+
+const usePriceFeed = (url = PRICE_FEED_URL, ttl = PRICE_TTL_MS) => {
+  const [prices, setPrices] = useState(priceFeed.data);
+  useEffect(() => {
+    priceFeed.listeners.add(setPrices);
+    priceFeed.refresh(url, ttl);
+    const i = url ? setInterval(() => priceFeed.refresh(url, ttl), ttl) : null;
+    return () => { clearInterval(i); priceFeed.listeners.delete(setPrices); };
+  }, [url, ttl]);
+  return prices;
+};
+
 const GLOSSARY = {
   "Carbon Liability": "Present value of future carbon costs over asset lifetime",
   "ETS": "Emissions Trading System - market-based pollution control",
@@ -111,6 +158,36 @@ const Card = ({ label, value, sub, color = "text-white", tip }) => (
   </div>
 );
 
+// Price widgets subscribe to the feed themselves so ticks don't re-render the dashboard
+const PriceTicker = () => {
+  const prices = usePriceFeed();
+  return (
+    <div className="bg-slate-900 border-b border-slate-700 overflow-hidden py-2">
+      <div className="flex gap-8 animate-marquee whitespace-nowrap">
+        {[...prices, ...prices].map((p, i) => <div key={i} className="flex items-center gap-2 text-sm">{p.flag} {p.market} <span className="font-bold">{p.currency}{p.price}</span></div>)}
+      </div>
+    </div>
+  );
+};
+
+const EuEtsCard = () => {
+  const prices = usePriceFeed();
+  const eu = prices.find(p => p.market === 'EU ETS') || prices[0];
+  return <Card label="EU ETS" value={`${eu.currency}${eu.price}`} color="text-green-400" />;
+};
+
+const GlobalPricesChart = () => {
+  const prices = usePriceFeed();
+  return (
+    <ResponsiveContainer width="100%" height={200}>
+      <BarChart data={prices} layout="vertical">
+        <CartesianGrid strokeDasharray="3 3" stroke="#475569" /><XAxis type="number" tick={{ fill: '#94a3b8' }} /><YAxis type="category" dataKey="market" tick={{ fill: '#94a3b8', fontSize: 10 }} width={70} /><Tooltip />
+        <Bar dataKey="price" radius={[0, 4, 4, 0]}>{prices.map((e, i) => <Cell key={i} fill={e.market.includes('India') ? '#f59e0b' : '#3b82f6'} />)}</Bar>
+      </BarChart>
+    </ResponsiveContainer>
+  );
+};
+
 const Insight = ({ type, title, detail, action }) => {
   const [open, setOpen] = useState(false);
   const styles = { critical: "border-red-600 from-red-900/50", warning: "border-amber-600 from-amber-900/50", success: "border-green-600 from-green-900/50", info: "border-blue-600 from-blue-900/50" };
@@ -247,10 +324,8 @@ export default function CarbonDashboardV6() {
   const [onboard, setOnboard] = useState(() => !localStorage.getItem('carbonOnboarded'));
   const [onboardStep, setOnboardStep] = useState(0);
   const [saved, setSaved] = useState(() => { try { return JSON.parse(localStorage.getItem('carbonV6') || '[]'); } catch { return []; } });
-  const [prices, setPrices] = useState(globalPrices);
 
   useEffect(() => { localStorage.setItem('carbonV6', JSON.stringify(saved)); }, [saved]);
-  useEffect(() => { const i = setInterval(() => setPrices(p => p.map(x => ({ ...x, price: +(x.price + (Math.random() - 0.5) * 0.4).toFixed(1) }))), 5000); return () => clearInterval(i); }, []);
   useEffect(() => {
     const handler = e => {
       if (e.target.tagName === 'INPUT') return;
@@ -306,11 +381,7 @@ export default function CarbonDashboardV6() {
   return (
     <div className="min-h-screen bg-gradient-to-br from-slate-900 via-slate-800 to-slate-900 text-white">
       {/* Ticker */}
-      <div className="bg-slate-900 border-b border-slate-700 overflow-hidden py-2">
-        <div className="flex gap-8 animate-marquee whitespace-nowrap">
-          {[...prices, ...prices].map((p, i) => <div key={i} className="flex items-center gap-2 text-sm">{p.flag} {p.market} <span className="font-bold">{p.currency}{p.price}</span></div>)}
-        </div>
-      </div>
+      <PriceTicker />
 
       <div className="p-3 md:p-4 max-w-7xl mx-auto">
         {/* Header */}
@@ -331,7 +402,7 @@ export default function CarbonDashboardV6() {
           <Card label="90% RANGE" value={`$${mc.p5.toFixed(1)}-${mc.p95.toFixed(1)}B`} sub="Monte Carlo" color="text-purple-400" tip="monte" />
           <Card label="GOVT EXPOSURE" value="$17.7B" sub="PSU + stranded" color="text-red-400" tip="govt" />
           <Card label="BASE CASE" value="$13.1B" sub="Aggressive" color="text-blue-400" />
-          <Card label="EU ETS" value={`€${prices[0].price}`} color="text-green-400" />
+          <EuEtsCard />
           <Card label="WARNINGS" value={insights.filter(i => i.type === 'critical' || i.type === 'warning').length} sub="AI alerts" color="text-orange-400" />
         </div>
 
@@ -376,12 +447,7 @@ export default function CarbonDashboardV6() {
               </div>
               <div className="bg-slate-800/50 rounded-lg p-4 border border-slate-700">
                 <h3 className="font-semibold mb-3">🌍 Global Prices</h3>
-                <ResponsiveContainer width="100%" height={200}>
-                  <BarChart data={prices} layout="vertical">
-                    <CartesianGrid strokeDasharray="3 3" stroke="#475569" /><XAxis type="number" tick={{ fill: '#94a3b8' }} /><YAxis type="category" dataKey="market" tick={{ fill: '#94a3b8', fontSize: 10 }} width={70} /><Tooltip />
-                    <Bar dataKey="price" radius={[0, 4, 4, 0]}>{prices.map((e, i) => <Cell key={i} fill={e.market.includes('India') ? '#f59e0b' : '#3b82f6'} />)}</Bar>
-                  </BarChart>
-                </ResponsiveContainer>
+                <GlobalPricesChart />
               </div>
               <div className="bg-slate-800/50 rounded-lg p-4 border border-slate-700 md:col-span-2">
                 <h3 className="font-semibold mb-3">⚡ Top Insight</h3>
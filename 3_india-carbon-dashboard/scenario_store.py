@@ -0,0 +1,223 @@
+"""
+Scenario Store
+SQLite persistence for named CarbonModel scenarios with precomputed results
+"""
+
+import copy
+import json
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from carbon_liability import CarbonModel, Scenario
+
+# Columns answerable straight from the table (no recomputation)
+RESULT_COLUMNS = ["liability", "p5", "p25", "p50", "p75", "p95", "mc_mean", "mc_std",
+                  "var_99", "cvar_99"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    carbon_price REAL NOT NULL,
+    discount_rate REAL NOT NULL,
+    pathway TEXT NOT NULL,
+    liability REAL NOT NULL,
+    p5 REAL, p25 REAL, p50 REAL, p75 REAL, p95 REAL,
+    mc_mean REAL, mc_std REAL,
+    var_99 REAL, cvar_99 REAL,
+    n_simulations INTEGER NOT NULL,
+    seed INTEGER,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_pathway_price_rate
+    ON scenarios (pathway, carbon_price, discount_rate);
+CREATE INDEX IF NOT EXISTS idx_scenarios_price ON scenarios (carbon_price);
+CREATE INDEX IF NOT EXISTS idx_scenarios_rate ON scenarios (discount_rate);
+CREATE INDEX IF NOT EXISTS idx_scenarios_liability ON scenarios (liability);
+"""
+
+ScenarioSpec = Union[Scenario, Dict, Tuple[float, float, str]]
+
+
+def _as_scenario(spec: ScenarioSpec) -> Scenario:
+    if isinstance(spec, Scenario):
+        return spec
+    if isinstance(spec, dict):
+        return Scenario(**spec)
+    return Scenario(*spec)
+
+
+class ScenarioStore:
+    """
+    Named scenarios with liability, Monte Carlo quantiles and summary
+    computed once at save time
+
+    Example usage:
+        store = ScenarioStore("scenarios.db")
+        store.save("EU parity", (68.5, 8, "Moderate"), seed=1)
+        store.rank(by="p95", pathway="Moderate", limit=10)
+        store.compare(["EU parity", "Base"])
+    """
+
+    def __init__(self, path: str = ":memory:", model: Optional[CarbonModel] = None):
+        # `model` supplies the refineries, backend and precision used to evaluate scenarios
+        self.path = path
+        self.model = model or CarbonModel()
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'ScenarioStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM scenarios WHERE name = ?", (name,)).fetchone() is not None
+
+    def _compute(self, name: str, scenario: Scenario, n_simulations: int,
+                 seed: Optional[int]) -> Dict:
+        """Evaluate a scenario into a table row"""
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2**63)
+        model = copy.copy(self.model).set_scenario(
+            scenario.carbon_price, scenario.discount_rate, scenario.pathway)
+        mc = model.monte_carlo(n_simulations, seed=seed)
+        summary = model.summary(n_simulations, seed=seed, mc=mc)
+        risk = summary["risk"]["99.0%"]
+        return {
+            "name": name,
+            "carbon_price": scenario.carbon_price,
+            "discount_rate": scenario.discount_rate,
+            "pathway": scenario.pathway,
+            "liability": summary["liability"],
+            "p5": mc.p5, "p25": mc.p25, "p50": mc.p50, "p75": mc.p75, "p95": mc.p95,
+            "mc_mean": mc.mean, "mc_std": mc.std,
+            "var_99": risk["var"], "cvar_99": risk["cvar"],
+            "n_simulations": n_simulations,
+            "seed": seed,
+            "summary": json.dumps(summary),
+            "created_at": time.time()
+        }
+
+    def save(self, name: str, scenario: ScenarioSpec, n_simulations: int = 1000,
+             seed: Optional[int] = None, overwrite: bool = False) -> Dict:
+        """
+        Compute and persist a named scenario
+
+        Args:
+            name: Unique scenario name
+            scenario: Scenario, dict of its fields, or (price, rate, pathway)
+            n_simulations: Monte Carlo iterations
+            seed: RNG seed (generated and recorded if omitted)
+            overwrite: Replace an existing scenario of the same name
+
+        Returns:
+            Stored row as a dict
+        """
+        return self.save_many([(name, scenario)], n_simulations, seed, overwrite)[0]
+
+    def save_many(self, items: Iterable[Tuple[str, ScenarioSpec]], n_simulations: int = 1000,
+                  seed: Optional[int] = None, overwrite: bool = False) -> List[Dict]:
+        """Compute and persist many scenarios in one transaction"""
+        rows = [self._compute(name, _as_scenario(spec), n_simulations, seed)
+                for name, spec in items]
+        if not rows:
+            return rows
+        columns = list(rows[0])
+        verb = "INSERT OR REPLACE" if overwrite else "INSERT"
+        sql = (f"{verb} INTO scenarios ({', '.join(columns)}) "
+               f"VALUES ({', '.join(':' + c for c in columns)})")
+        try:
+            with self.conn:
+                self.conn.executemany(sql, rows)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Scenario already exists (use overwrite=True): {e}") from None
+        return rows
+
+    def get(self, name: str) -> Dict:
+        """Stored scenario with its parsed summary"""
+        row = self.conn.execute("SELECT * FROM scenarios WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"No scenario named: {name}")
+        record = dict(row)
+        record["summary"] = json.loads(record["summary"])
+        return record
+
+    def delete(self, name: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM scenarios WHERE name = ?", (name,))
+
+    def query(self, pathway: Optional[str] = None,
+              price_range: Optional[Tuple[float, float]] = None,
+              rate_range: Optional[Tuple[float, float]] = None,
+              order_by: str = "name", ascending: bool = True,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Filter stored scenarios by pathway and price/rate ranges
+
+        Args:
+            pathway: BAU|Moderate|Aggressive|Early Action
+            price_range: Inclusive (min, max) carbon price
+            rate_range: Inclusive (min, max) discount rate
+            order_by: Column to sort by
+            ascending: Sort direction
+            limit: Maximum rows
+
+        Returns:
+            DataFrame of stored scenarios (summary JSON excluded)
+        """
+        valid = {"name", "carbon_price", "discount_rate", "pathway", "created_at", *RESULT_COLUMNS}
+        if order_by not in valid:
+            raise ValueError(f"Invalid order_by. Choose from: {sorted(valid)}")
+        clauses, params = [], []
+        if pathway:
+            clauses.append("pathway = ?")
+            params.append(pathway)
+        if price_range:
+            clauses.append("carbon_price BETWEEN ? AND ?")
+            params.extend(price_range)
+        if rate_range:
+            clauses.append("discount_rate BETWEEN ? AND ?")
+            params.extend(rate_range)
+        sql = ("SELECT name, carbon_price, discount_rate, pathway, "
+               f"{', '.join(RESULT_COLUMNS)}, n_simulations, seed, created_at FROM scenarios")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} {'ASC' if ascending else 'DESC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def rank(self, by: str = "liability", ascending: bool = True,
+             limit: Optional[int] = None, **filters) -> pd.DataFrame:
+        """Rank stored scenarios by a precomputed result column"""
+        df = self.query(order_by=by, ascending=ascending, limit=limit, **filters)
+        df.insert(0, "rank", range(1, len(df) + 1))
+        return df
+
+    def compare(self, names: List[str]) -> pd.DataFrame:
+        """Side-by-side table of stored results (one column per scenario)"""
+        if not names:
+            raise ValueError("compare() needs at least one scenario name")
+        marks = ", ".join("?" for _ in names)
+        df = pd.read_sql_query(
+            f"SELECT name, carbon_price, discount_rate, pathway, {', '.join(RESULT_COLUMNS)} "
+            f"FROM scenarios WHERE name IN ({marks})", self.conn, params=list(names))
+        missing = set(names) - set(df["name"])
+        if missing:
+            raise KeyError(f"No scenario named: {sorted(missing)}")
+        return df.set_index("name").loc[names].T
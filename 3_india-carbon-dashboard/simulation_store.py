@@ -0,0 +1,223 @@
+"""
+Simulation Store
+Out-of-core storage for raw Monte Carlo draws
+"""
+
+import json
+import os
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+HISTOGRAM_BINS = 1 << 16
+
+
+def tail_rank(q: float, n: int) -> int:
+    """
+    0-based order statistic used as the q-level tail threshold (VaR)
+
+    The tail at level q is the draws from this rank up, i.e. the
+    top n - ceil(q * n) + 1 draws of a sorted sample.
+    """
+    return min(int(np.ceil(q * n)) - 1, n - 1) if q > 0 else 0
+
+
+def _metadata_path(path: str) -> str:
+    """Sidecar JSON file holding scenario metadata and seed"""
+    return os.path.splitext(path)[0] + ".json"
+
+
+class SimulationStore:
+    """
+    Memory-mapped store of raw Monte Carlo draws
+
+    Draws live in a `.npy` file opened with `mmap_mode`, so reopening a run
+    is zero-copy and queries stream over the file in chunks instead of
+    loading (or sorting) the whole array in RAM.
+
+    Example usage:
+        store = CarbonModel().monte_carlo_to_store("run.npy", 10**9, seed=42)
+        store = SimulationStore.open("run.npy")
+        store.quantile([0.05, 0.95])
+        store.exceedance_probability(20.0)
+    """
+
+    def __init__(self, path: str, draws: np.ndarray, metadata: Dict,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.draws = draws
+        self.metadata = metadata
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def create(cls, path: str, n_draws: int, metadata: Optional[Dict] = None,
+               dtype: Union[str, np.dtype] = np.float64,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'SimulationStore':
+        """
+        Allocate a new writable store on disk
+
+        Args:
+            path: Target `.npy` file
+            n_draws: Total number of draws the store will hold
+            metadata: Scenario parameters, seed, etc. (JSON-serialisable)
+            dtype: Storage dtype
+            chunk_size: Draws per chunk for writes and queries
+
+        Returns:
+            SimulationStore backed by a writable memmap
+        """
+        if n_draws <= 0:
+            raise ValueError("n_draws must be positive")
+        draws = np.lib.format.open_memmap(path, mode="w+", dtype=np.dtype(dtype),
+                                          shape=(n_draws,))
+        metadata = dict(metadata or {})
+        metadata.update({"n_draws": int(n_draws), "dtype": np.dtype(dtype).name})
+        with open(_metadata_path(path), "w") as f:
+            json.dump(metadata, f, indent=2)
+        return cls(path, draws, metadata, chunk_size)
+
+    @classmethod
+    def open(cls, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'SimulationStore':
+        """Reopen an existing store read-only (zero-copy)"""
+        draws = np.load(path, mmap_mode="r")
+        meta_path = _metadata_path(path)
+        metadata = {}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                metadata = json.load(f)
+        return cls(path, draws, metadata, chunk_size)
+
+    def __len__(self) -> int:
+        return len(self.draws)
+
+    def __repr__(self):
+        return f"SimulationStore(path={self.path!r}, n_draws={len(self)}, dtype={self.draws.dtype})"
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """Iterate over the draws as memmap views of `chunk_size`"""
+        for start in range(0, len(self.draws), self.chunk_size):
+            yield self.draws[start:start + self.chunk_size]
+
+    def flush(self) -> None:
+        """Flush pending writes to disk"""
+        if isinstance(self.draws, np.memmap):
+            self.draws.flush()
+
+    def to_arrow(self):
+        """Draws as a pyarrow Array over the memory map (no copy)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow() requires pyarrow: pip install pyarrow") from None
+        return pa.array(self.draws)
+
+    # Queries
+
+    def mean(self) -> float:
+        """Mean of all draws"""
+        return sum(float(np.sum(c, dtype=np.float64)) for c in self.chunks()) / len(self)
+
+    def min_max(self) -> tuple:
+        """Minimum and maximum draw"""
+        lo, hi = np.inf, -np.inf
+        for c in self.chunks():
+            lo = min(lo, float(c.min()))
+            hi = max(hi, float(c.max()))
+        return lo, hi
+
+    def exceedance_probability(self, threshold: float) -> float:
+        """P(draw > threshold)"""
+        count = sum(int(np.count_nonzero(c > threshold)) for c in self.chunks())
+        return count / len(self)
+
+    def conditional_tail_mean(self, threshold: float) -> float:
+        """E[draw | draw > threshold] (nan if no draw exceeds it)"""
+        total, count = 0.0, 0
+        for c in self.chunks():
+            tail = c[c > threshold]
+            total += float(np.sum(tail, dtype=np.float64))
+            count += len(tail)
+        return total / count if count else float("nan")
+
+    def tail_mean(self, q: float) -> float:
+        """
+        Mean of the draws from the q-level VaR up (Expected Shortfall)
+
+        Matches `np.sort(draws)[tail_rank(q, n):].mean()`; ties at the
+        threshold are counted only as often as they fall in the tail.
+        """
+        k = tail_rank(q, len(self))
+        var = float(self.order_statistics(np.array([k]))[0])
+        total, count = 0.0, 0
+        for c in self.chunks():
+            tail = c[c > var]
+            total += float(np.sum(tail, dtype=np.float64))
+            count += len(tail)
+        return (total + (len(self) - k - count) * var) / (len(self) - k)
+
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Exact quantiles over the memmap, matching `np.quantile` (linear)
+
+        Args:
+            q: Quantile or array of quantiles in [0, 1]
+
+        Returns:
+            Quantile value(s)
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Quantiles must be in [0, 1]")
+        pos = qs * (len(self) - 1)
+        lower = np.floor(pos).astype(np.int64)
+        upper = np.minimum(lower + 1, len(self) - 1)
+        ranks = np.unique(np.concatenate([lower, upper]))
+        stats = dict(zip(ranks.tolist(), self.order_statistics(ranks)))
+        lo = np.array([stats[k] for k in lower.tolist()])
+        hi = np.array([stats[k] for k in upper.tolist()])
+        result = lo + (pos - lower) * (hi - lo)
+        return float(result[0]) if np.ndim(q) == 0 else result
+
+    def order_statistics(self, ranks: np.ndarray) -> np.ndarray:
+        """
+        k-th smallest draws for each rank in `ranks` (0-based)
+
+        Streams the file twice: once to histogram the draws into fine bins,
+        once to collect only the bins holding the requested ranks, which are
+        then resolved with `np.partition`. Memory use is bounded by the bin
+        occupancy rather than the number of draws.
+        """
+        ranks = np.asarray(ranks, dtype=np.int64)
+        lo, hi = self.min_max()
+        if lo == hi:
+            return np.full(len(ranks), lo)
+        scale = HISTOGRAM_BINS / (hi - lo)
+
+        def bin_index(c):
+            idx = ((c - lo) * scale).astype(np.int64)
+            return np.minimum(idx, HISTOGRAM_BINS - 1)
+
+        counts = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        for c in self.chunks():
+            counts += np.bincount(bin_index(c), minlength=HISTOGRAM_BINS)
+        cum = np.cumsum(counts)
+        target_bins = np.searchsorted(cum, ranks, side="right")
+        wanted = np.unique(target_bins)
+
+        collected = {b: [] for b in wanted.tolist()}
+        for c in self.chunks():
+            idx = bin_index(c)
+            mask = np.isin(idx, wanted)
+            if not mask.any():
+                continue
+            vals, bins = c[mask], idx[mask]
+            for b in np.unique(bins).tolist():
+                collected[b].append(np.asarray(vals[bins == b]))
+
+        result = np.empty(len(ranks))
+        for i, (k, b) in enumerate(zip(ranks.tolist(), target_bins.tolist())):
+            values = np.concatenate(collected[b])
+            offset = k - (cum[b] - counts[b])
+            result[i] = np.partition(values, offset)[offset]
+        return result
@@ -0,0 +1,73 @@
+"""Tests for compute backends module."""
+import warnings
+import pytest
+import numpy as np
+import sys
+sys.path.insert(0, '..')
+
+import backends
+from backends import get_backend, NumpyBackend
+from carbon_liability import CarbonModel
+
+def test_default_backend_is_numpy(monkeypatch):
+    """Test NumPy is selected when nothing is configured."""
+    monkeypatch.delenv("CARBON_BACKEND", raising=False)
+    assert isinstance(get_backend(), NumpyBackend)
+    with pytest.raises(ValueError):
+        get_backend("cuda")
+
+def test_numba_falls_back_when_missing(monkeypatch):
+    """Test requesting numba without it installed falls back to NumPy."""
+    monkeypatch.setattr(backends, "numba", None)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        kernel = get_backend("numba")
+    assert isinstance(kernel, NumpyBackend)
+    assert caught
+    assert isinstance(get_backend("auto"), NumpyBackend)
+
+def test_seeded_monte_carlo_reproducible():
+    """Test a fixed seed reproduces the same simulation."""
+    a = CarbonModel().monte_carlo(500, seed=11)
+    b = CarbonModel().monte_carlo(500, seed=11)
+    assert np.array_equal(a.simulations, b.simulations)
+
+def test_numba_matches_numpy():
+    """Test both backends give identical draws for a fixed seed."""
+    pytest.importorskip("numba")
+    args = (10_000, 13.1, 0.6, 0.4)
+    x = get_backend("numpy").draws(np.random.default_rng(3), *args)
+    y = get_backend("numba").draws(np.random.default_rng(3), *args)
+    assert np.array_equal(x, y)
+    assert np.allclose(get_backend("numpy").moments(np.random.default_rng(3), *args),
+                       get_backend("numba").moments(np.random.default_rng(3), *args))
+    w, beta = np.array([0.25, 0.75]), np.array([1.6, 0.8])
+    assert np.array_equal(get_backend("numpy").draw_matrix(np.random.default_rng(3), *args, w, beta),
+                          get_backend("numba").draw_matrix(np.random.default_rng(3), *args, w, beta))
+
+def test_draw_matrix_rows_match_draws():
+    """Test facility rows split the scalar draws by weight and exposure."""
+    weights = np.array([0.5, 0.3, 0.2])
+    for name in ["numpy", "numba"] if backends.numba is not None else ["numpy"]:
+        kernel = get_backend(name)
+        totals = kernel.draws(np.random.default_rng(5), 2000, 13.1, 0.6, 0.4)
+        matrix = kernel.draw_matrix(np.random.default_rng(5), 2000, 13.1, 0.6, 0.4, weights)
+        assert matrix.shape == (2000, 3)
+        assert np.allclose(matrix.sum(axis=1), totals)
+        assert np.allclose(matrix[:, 0], totals * 0.5)
+        exposed = kernel.draw_matrix(np.random.default_rng(5), 2000, 13.1, 0.6, 0.4, weights,
+                                     np.array([1.4, 0.5, 0.75]))
+        assert np.allclose(exposed.sum(axis=1), totals)
+        assert exposed[:, 0].std() > matrix[:, 0].std()
+
+def test_model_moments_stream_monte_carlo():
+    """Test streamed moments match the stored Monte Carlo draws."""
+    model = CarbonModel()
+    model.backend.block_size = 1000
+    mean, std = model.moments(5000, seed=8)
+    draws = model.monte_carlo(5000, seed=8).simulations
+    assert mean == pytest.approx(draws.mean())
+    assert std == pytest.approx(draws.std())
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,13 @@
 """Tests for carbon liability module."""
+import json
 import pytest
+import numpy as np
+import pandas as pd
 import sys
 sys.path.insert(0, '..')
 
 from carbon_liability import CarbonModel
+from simulation_store import tail_rank
 
 def test_model_initialization():
     """Test CarbonModel can be instantiated."""
@@ -29,5 +33,95 @@ def test_monte_carlo_returns_dict():
     result = model.monte_carlo(n_simulations=100)
     assert 'mean' in result or 'p5' in result or isinstance(result, dict)
 
+def test_risk_metrics_tail_ordering():
+    """Test VaR and ES are ordered and match a full-sort reference."""
+    model = CarbonModel()
+    risk = model.risk_metrics(n_simulations=20000, seed=0)
+    ordered = np.sort(risk.simulations)
+    for a in risk.levels:
+        k = int(np.ceil(a * len(ordered))) - 1
+        assert risk.var[a] == pytest.approx(ordered[k])
+        assert risk.cvar[a] == pytest.approx(ordered[k:].mean())
+        assert risk.cvar[a] >= risk.var[a]
+    assert risk.var[0.95] <= risk.var[0.99] <= risk.var[0.995]
+
+def test_risk_contributions_sum_to_totals():
+    """Test Euler contributions add up to VaR and ES per level."""
+    risk = CarbonModel().risk_metrics(n_simulations=5000, seed=1)
+    for a in risk.levels:
+        assert risk.cvar_contributions[a].sum() == pytest.approx(risk.cvar[a])
+        assert risk.var_contributions[a].sum() == pytest.approx(risk.var[a])
+
+def test_risk_contributions_reflect_exposure():
+    """Test tail contributions depart from static weights by emission exposure."""
+    model = CarbonModel()
+    risk = model.risk_metrics(n_simulations=20000, seed=1)
+    ratio = risk.cvar_contributions[0.99] / risk.cvar[0.99] / model.facility_weights()
+    exposure = pd.Series(model.emission_exposure(), index=ratio.index)
+    assert ratio["BPCL Mumbai"] > 1.05 and ratio["Paradip"] < 0.95
+    assert ratio[exposure > 1].min() > ratio[exposure < 1].max()
+
+def test_risk_factor_path_matches_matrix():
+    """Test the two-factor risk path equals risk on the full facility matrix."""
+    model = CarbonModel()
+    fast = model.risk_metrics(n_simulations=3000, seed=2)
+    full = model.risk_metrics(simulations=model.facility_simulations(3000, seed=2))
+    for a in fast.levels:
+        assert fast.cvar[a] == pytest.approx(full.cvar[a])
+        assert np.allclose(fast.cvar_contributions[a], full.cvar_contributions[a])
+        assert np.allclose(fast.var_contributions[a], full.var_contributions[a])
+
+def test_risk_total_matches_monte_carlo():
+    """Test the simulated fleet total has the monte_carlo distribution."""
+    model = CarbonModel()
+    mc = model.monte_carlo(20000, seed=0)
+    risk = model.risk_metrics(n_simulations=20000, seed=0)
+    for a in risk.levels:
+        k = tail_rank(a, len(mc.simulations))
+        assert risk.var[a] == pytest.approx(mc.simulations[k])
+        assert risk.cvar[a] == pytest.approx(mc.simulations[k:].mean())
+    summary = model.summary(seed=0)
+    assert summary['risk']['95.0%']['var'] <= summary['risk']['99.0%']['var']
+    assert summary['risk']['99.0%']['var'] >= summary['monte_carlo']['p95']
+
+def test_summary_includes_risk():
+    """Test summary exposes VaR/ES."""
+    summary = CarbonModel().summary()
+    assert set(summary['risk']) == {'95.0%', '99.0%', '99.5%'}
+
+def test_float32_precision_and_out_buffer():
+    """Test float32 mode writes into a caller buffer without copying."""
+    model = CarbonModel(dtype='float32')
+    buf = np.empty(2000, dtype=np.float32)
+    mc = model.monte_carlo(2000, seed=4, out=buf)
+    assert mc.simulations is buf
+    assert np.all(np.diff(buf) >= 0)
+    ref = CarbonModel().monte_carlo(2000, seed=4)
+    assert np.allclose(buf, ref.simulations, rtol=1e-6)
+    sims = model.facility_simulations(100, seed=0)
+    assert sims.dtype == np.float32
+    with pytest.raises(ValueError):
+        CarbonModel(dtype='int32')
+
+def test_float32_summary_is_json_serialisable():
+    """Test float32 results come back as plain Python floats."""
+    summary = CarbonModel(dtype='float32').summary(seed=2)
+    assert json.loads(json.dumps(summary)) == summary
+    assert type(summary['monte_carlo']['mean']) is float
+
+def test_refinery_data_without_copy():
+    """Test unfiltered data can be returned without copying."""
+    model = CarbonModel()
+    assert model.get_refinery_data(copy=False) is model.refineries
+    assert model.get_refinery_data() is not model.refineries
+    assert set(model.get_refinery_data('PSU', 'B')['risk']) == {'B'}
+
+def test_to_arrow_shares_buffer():
+    """Test Arrow export is zero-copy."""
+    pytest.importorskip("pyarrow")
+    mc = CarbonModel().monte_carlo(500, seed=0)
+    arr = mc.to_arrow()
+    assert arr.buffers()[1].address == mc.simulations.ctypes.data
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""Tests for optimizer module."""
+import itertools
+import pytest
+import numpy as np
+import sys
+sys.path.insert(0, '..')
+
+from carbon_liability import CarbonModel
+from optimizer import action_tables, evaluate_portfolios, optimize_fleet, synthetic_fleet
+
+def test_respects_budget():
+    """Test the plan stays within budget and never increases liability."""
+    result = CarbonModel().optimize_investments(budget=15.0)
+    assert result.capex <= 15.0 + 1e-9
+    assert result.optimized_liability < result.baseline_liability
+    assert result.plan['capex'].sum() == pytest.approx(result.capex)
+    assert (result.plan['liability_after'] <= result.plan['liability_before']).all()
+
+def test_matches_brute_force():
+    """Test branch-and-bound finds the exhaustive optimum on small fleets."""
+    portfolios = np.array(list(itertools.product(range(4), repeat=6)))
+    for seed in range(5):
+        fleet = synthetic_fleet(6, seed)
+        cost, residual = action_tables(fleet, 13.1)
+        capex, liability = evaluate_portfolios(portfolios, cost, residual)
+        for budget in (0.5, 2.0, 5.0):
+            best = liability[capex <= budget + 1e-12].min()
+            result = optimize_fleet(fleet, 13.1, budget, gap_tol=0)
+            assert result.proven_optimal
+            assert result.optimized_liability == pytest.approx(best)
+
+def test_reported_gap_bounds_optimum():
+    """Test the reported gap is a valid bound when the search stops early."""
+    portfolios = np.array(list(itertools.product(range(4), repeat=7)))
+    fleet = synthetic_fleet(7, 3)
+    cost, residual = action_tables(fleet, 13.1)
+    capex, liability = evaluate_portfolios(portfolios, cost, residual)
+    best = liability[capex <= 2.0 + 1e-12].min()
+    for kwargs in ({"gap_tol": 0.05}, {"gap_tol": 0, "max_nodes": 2}):
+        result = optimize_fleet(fleet, 13.1, 2.0, **kwargs)
+        assert 0 <= result.gap <= 1
+        assert result.optimized_liability * (1 - result.gap) <= best + 1e-9
+    assert optimize_fleet(fleet, 13.1, 2.0, gap_tol=0.05).gap <= 0.05
+
+def test_parallel_search_agrees():
+    """Test sharding a tree that actually branches gives the same optimum."""
+    fleet = synthetic_fleet(100, 2)
+    serial = optimize_fleet(fleet, 13.1, 10.0, gap_tol=0)
+    assert serial.nodes > 1000
+    parallel = optimize_fleet(fleet, 13.1, 10.0, n_workers=2, gap_tol=0)
+    assert parallel.nodes > 100
+    assert serial.proven_optimal and parallel.proven_optimal
+    assert parallel.optimized_liability == pytest.approx(serial.optimized_liability)
+
+def test_parallel_matches_brute_force():
+    """Test the parallel search finds the exhaustive optimum."""
+    portfolios = np.array(list(itertools.product(range(4), repeat=8)))
+    fleet = synthetic_fleet(8, 0)
+    cost, residual = action_tables(fleet, 13.1)
+    capex, liability = evaluate_portfolios(portfolios, cost, residual)
+    best = liability[capex <= 0.4 + 1e-12].min()
+    result = optimize_fleet(fleet, 13.1, 0.4, n_workers=2, gap_tol=0)
+    assert result.nodes > 20
+    assert result.optimized_liability == pytest.approx(best)
+
+def test_large_fleet():
+    """Test a 10^4-refinery fleet solves within budget."""
+    fleet = synthetic_fleet(10_000, 1)
+    result = optimize_fleet(fleet, fleet['liability'].sum(), 500.0)
+    assert result.capex <= 500.0 + 1e-9
+    assert len(result.plan) == 10_000
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
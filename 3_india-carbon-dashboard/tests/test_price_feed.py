@@ -0,0 +1,138 @@
+"""Tests for price feed module."""
+import asyncio
+import http.server
+import json
+import threading
+import time
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from carbon_liability import CarbonModel
+from price_feed import (PriceFeed, PriceFeedAdapter, StaticPriceFeed, FilePriceFeed, HTTPPriceFeed,
+                        DEFAULT_PRICES, feed_from_source)
+
+class SlowFeed(PriceFeedAdapter):
+    """Counts fetches and blocks briefly to expose concurrent callers."""
+    def __init__(self):
+        self.calls = 0
+        self.price = 70.0
+
+    def fetch(self):
+        self.calls += 1
+        time.sleep(0.05)
+        return StaticPriceFeed([{"market": "EU ETS", "price": self.price, "currency": "€"}]).fetch()
+
+class BrokenFeed(PriceFeedAdapter):
+    """Counts fetches and always fails."""
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        raise OSError("source down")
+
+def test_ttl_cache():
+    """Test quotes are cached until the TTL expires."""
+    now = [0.0]
+    adapter = SlowFeed()
+    feed = PriceFeed(adapter, ttl=10, clock=lambda: now[0])
+    assert feed.latest("EU ETS").price == 70.0
+    adapter.price = 75.0
+    assert feed.latest("EU ETS").price == 70.0
+    now[0] = 11.0
+    assert feed.latest("EU ETS").price == 75.0
+    assert adapter.calls == 2
+
+def test_concurrent_requests_coalesce():
+    """Test many simultaneous callers share one fetch."""
+    adapter = SlowFeed()
+    feed = PriceFeed(adapter, ttl=60)
+    threads = [threading.Thread(target=feed.get) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert adapter.calls == 1
+
+def test_file_feed_drives_liability(tmp_path):
+    """Test a file source feeds the model's carbon price."""
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps([{"market": "EU ETS", "price": 100.0, "currency": "€"}]))
+    feed = feed_from_source(str(path))
+    assert isinstance(feed.adapter, FilePriceFeed)
+    model = CarbonModel().use_feed_price(feed, fx_rate=1.1)
+    assert model.scenario.carbon_price == pytest.approx(110.0)
+    assert model.calculate_liability() == CarbonModel().calculate_liability(carbon_price=110.0)
+    with pytest.raises(ValueError):
+        CarbonModel().use_feed_price(feed)
+
+def test_failed_fetch_falls_back():
+    """Test a failing source serves fallback quotes and waits a TTL to retry."""
+    now = [0.0]
+    adapter = BrokenFeed()
+    feed = PriceFeed(adapter, ttl=10, clock=lambda: now[0])
+    assert feed.latest("EU ETS").price == DEFAULT_PRICES[0]["price"]
+    assert feed.is_stale and isinstance(feed.last_error, OSError)
+    feed.get()
+    assert adapter.calls == 1
+    now[0] = 11.0
+    feed.get()
+    assert adapter.calls == 2
+
+def test_failed_refresh_keeps_last_good():
+    """Test a refresh failure keeps serving the last fetched quotes."""
+    now = [0.0]
+    feed = PriceFeed(SlowFeed(), ttl=10, clock=lambda: now[0])
+    assert feed.latest("EU ETS").price == 70.0
+    feed.adapter = BrokenFeed()
+    now[0] = 11.0
+    assert feed.latest("EU ETS").price == 70.0
+    assert feed.is_stale
+
+def test_http_feed():
+    """Test the HTTP adapter reads a {"prices": [...]} payload."""
+    body = json.dumps({"prices": [{"market": "EU ETS", "price": 71.2, "currency": "€",
+                                   "flag": "🇪🇺"}]}).encode()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        feed = feed_from_source(f"http://127.0.0.1:{server.server_port}/prices")
+        assert isinstance(feed.adapter, HTTPPriceFeed)
+        quote = feed.latest("EU ETS")
+        assert (quote.price, quote.currency) == (71.2, "€")
+        assert not feed.is_stale
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_poll_reports_updates():
+    """Test async polling calls back once per changed snapshot."""
+    feed = PriceFeed(StaticPriceFeed(), ttl=0)
+    updates = []
+
+    async def run():
+        stop = asyncio.Event()
+        task = asyncio.create_task(feed.poll(updates.append, interval=0.01, stop=stop))
+        await asyncio.sleep(0.05)
+        stop.set()
+        await task
+
+    asyncio.run(run())
+    assert len(updates) == 1
+    assert updates[0][0].market == "EU ETS"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
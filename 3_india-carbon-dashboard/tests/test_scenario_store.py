@@ -0,0 +1,81 @@
+"""Tests for scenario store module."""
+import json
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from carbon_liability import CarbonModel
+from scenario_store import ScenarioStore
+
+def test_save_stores_precomputed_results():
+    """Test saving computes liability, quantiles and summary once."""
+    store = ScenarioStore()
+    row = store.save("EU parity", (68.5, 8, "Moderate"), seed=1)
+    model = CarbonModel().set_scenario(68.5, 8, "Moderate")
+    assert row["liability"] == model.calculate_liability()
+    assert row["p50"] == model.monte_carlo(1000, seed=1).p50
+    stored = store.get("EU parity")
+    assert stored["summary"]["monte_carlo"]["p50"] == stored["p50"]
+    assert "EU parity" in store
+
+def test_save_runs_monte_carlo_once(monkeypatch):
+    """Test the stored summary reuses the row's Monte Carlo run."""
+    calls = []
+    monte_carlo = CarbonModel.monte_carlo
+    monkeypatch.setattr(CarbonModel, "monte_carlo",
+                        lambda self, *a, **kw: calls.append(a) or monte_carlo(self, *a, **kw))
+    row = ScenarioStore().save("Base", (50, 10, "Aggressive"), seed=4)
+    assert len(calls) == 1
+    monkeypatch.undo()
+    assert json.loads(row["summary"]) == CarbonModel().summary(1000, seed=4)
+
+def test_store_uses_model_precision():
+    """Test scenarios are evaluated at the store model's dtype."""
+    store = ScenarioStore(model=CarbonModel(dtype='float32'))
+    row = store.save("Base", (50, 10, "Aggressive"), seed=4)
+    expected = CarbonModel(dtype='float32').monte_carlo(1000, seed=4)
+    assert row["mc_mean"] == expected.mean
+    assert all(type(row[c]) is float for c in ["p5", "p50", "p95", "mc_mean", "mc_std"])
+
+def test_store_uses_model_refineries():
+    """Test risk and summary use the store model's refinery table."""
+    model = CarbonModel()
+    model.refineries = model.refineries.head(5)
+    store = ScenarioStore(model=model)
+    row = store.save("Top five", (70, 8, "Moderate"), seed=3)
+    assert store.get("Top five")["summary"]["refineries"]["total"] == 5
+    assert model.scenario.carbon_price == 50
+    reference = CarbonModel().set_scenario(70, 8, "Moderate")
+    reference.refineries = model.refineries
+    assert row["cvar_99"] == round(reference.risk_metrics(1000, seed=3).cvar[0.99], 1)
+
+def test_duplicate_names_rejected():
+    """Test names are unique unless overwriting."""
+    store = ScenarioStore()
+    store.save("Base", (50, 10, "Aggressive"), seed=0)
+    with pytest.raises(ValueError):
+        store.save("Base", (60, 10, "Aggressive"), seed=0)
+    store.save("Base", (60, 10, "Aggressive"), seed=0, overwrite=True)
+    assert store.get("Base")["carbon_price"] == 60
+    assert len(store) == 1
+
+def test_query_rank_and_compare(tmp_path):
+    """Test filtering, ranking and comparison come from stored rows."""
+    path = str(tmp_path / "scenarios.db")
+    with ScenarioStore(path) as store:
+        store.save_many([(f"{p}-{price}", (price, 10, p))
+                         for p in ("BAU", "Moderate") for price in range(20, 120, 20)], seed=2)
+    store = ScenarioStore(path)
+    moderate = store.query(pathway="Moderate", price_range=(40, 80))
+    assert list(moderate["carbon_price"]) == [40, 60, 80]
+    ranked = store.rank(by="liability", ascending=False, limit=3)
+    assert list(ranked["name"]) == ["BAU-100", "Moderate-100", "BAU-80"]
+    table = store.compare(["BAU-20", "Moderate-20"])
+    assert table.loc["liability", "BAU-20"] > table.loc["liability", "Moderate-20"]
+    with pytest.raises(KeyError):
+        store.compare(["missing"])
+    with pytest.raises(ValueError):
+        store.compare([])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
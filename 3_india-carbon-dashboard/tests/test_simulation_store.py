@@ -0,0 +1,49 @@
+"""Tests for simulation store module."""
+import pytest
+import numpy as np
+import sys
+sys.path.insert(0, '..')
+
+from carbon_liability import CarbonModel
+from simulation_store import SimulationStore, tail_rank
+
+def test_store_roundtrip(tmp_path):
+    """Test draws and metadata survive reopening the store."""
+    path = str(tmp_path / "run.npy")
+    model = CarbonModel().set_scenario(75, 8, "Moderate")
+    written = model.monte_carlo_to_store(path, 10_000, seed=7, chunk_size=999)
+    store = SimulationStore.open(path)
+    assert isinstance(store.draws, np.memmap)
+    assert store.metadata["seed"] == 7
+    assert store.metadata["scenario"]["pathway"] == "Moderate"
+    assert np.array_equal(np.asarray(store.draws), np.asarray(written.draws))
+
+def test_draws_independent_of_chunk_size(tmp_path):
+    """Test a fixed seed gives the same draws for any chunk size."""
+    model = CarbonModel()
+    a = model.monte_carlo_to_store(str(tmp_path / "a.npy"), 5_000, seed=1, chunk_size=100)
+    b = model.monte_carlo_to_store(str(tmp_path / "b.npy"), 5_000, seed=1, chunk_size=4096)
+    assert np.array_equal(a.draws, b.draws)
+
+def test_queries_match_in_memory(tmp_path):
+    """Test streamed queries agree with in-memory NumPy results."""
+    store = CarbonModel().monte_carlo_to_store(str(tmp_path / "run.npy"), 20_000,
+                                               seed=3, chunk_size=1_500)
+    draws = np.asarray(store.draws)
+    qs = np.array([0.0, 0.05, 0.5, 0.95, 0.995, 1.0])
+    assert np.allclose(store.quantile(qs), np.quantile(draws, qs))
+    assert store.exceedance_probability(15.0) == pytest.approx(np.mean(draws > 15.0))
+    assert store.conditional_tail_mean(15.0) == pytest.approx(draws[draws > 15.0].mean())
+    assert store.mean() == pytest.approx(draws.mean())
+
+def test_tail_mean_matches_sorted_tail(tmp_path):
+    """Test streamed Expected Shortfall equals the sorted-tail mean."""
+    store = CarbonModel().monte_carlo_to_store(str(tmp_path / "run.npy"), 20_000,
+                                               seed=5, chunk_size=1_500)
+    ordered = np.sort(np.asarray(store.draws))
+    for q in (0.95, 0.99, 0.995):
+        k = tail_rank(q, len(ordered))
+        assert store.tail_mean(q) == pytest.approx(ordered[k:].mean())
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])